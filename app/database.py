@@ -1,20 +1,66 @@
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Text, Boolean
+from sqlalchemy import create_engine, event, Column, Integer, SmallInteger, String, Float, DateTime, Text, Boolean, LargeBinary, MetaData, Table, TypeDecorator, bindparam, select, update, func, case, inspect
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.sql import text
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.engine import make_url
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from datetime import datetime
 import os
-from typing import List, Optional
+import sys
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
 import json
+import logging
+
+from app.models import Action, GameResult, Position
+
+logger = logging.getLogger(__name__)
 
 # Database configuration
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./poker_bot.db")
 
-# Create engine
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
-)
+# Connection pool configuration
+url = make_url(DATABASE_URL)
+if DATABASE_URL.startswith("sqlite"):
+    engine_options = {"connect_args": {"check_same_thread": False}}
+    if url.database in (None, "", ":memory:"):
+        # Each in-memory connection is its own empty database, so everything must share one
+        engine_options["poolclass"] = StaticPool
+    # File databases keep the default QueuePool: each session gets its own connection and
+    # transaction, which WAL lets read alongside the writer
+else:
+    engine_options = {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "10")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "20")),
+        "pool_timeout": 30,
+        "pool_recycle": 1800,
+        "pool_pre_ping": True,
+    }
+    if url.get_backend_name() == "postgresql" and url.get_driver_name() == "psycopg2":
+        # Send bulk inserts as multi-row VALUES pages instead of one statement per row
+        engine_options["executemany_mode"] = "values_plus_batch"
+
+# Create engine; a larger compiled-statement cache keeps every query shape warm
+engine = create_engine(DATABASE_URL, future=True, query_cache_size=1200, **engine_options)
+
+if DATABASE_URL.startswith("sqlite"):
+    @event.listens_for(engine, "connect")
+    def _sqlite_pragmas(dbapi_connection, connection_record):
+        """Use WAL so readers don't block the writer, and relax per-commit fsync"""
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.close()
+
+# Dialects with INSERT ... ON CONFLICT support, used by save_setting
+_UPSERT_INSERTS = {"postgresql": pg_insert, "sqlite": sqlite_insert}
+
+# In-process cache for get_setting; each worker may serve a value up to the TTL old
+SETTINGS_CACHE_TTL = float(os.getenv("SETTINGS_CACHE_TTL", "30"))
+_settings_cache: Dict[str, Tuple[float, Optional[str]]] = {}
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -22,23 +68,78 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 # Create base class for models
 Base = declarative_base()
 
+# Compact card encoding: one byte per card, (rank_index << 2) | suit_index
+_CARD_RANKS = ('2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A')
+_CARD_SUITS = ('h', 'd', 'c', 's')
+_CARD_TABLE = tuple(sys.intern(rank + suit) for rank in _CARD_RANKS for suit in _CARD_SUITS)
+_CARD_INDEX = {card: index for index, card in enumerate(_CARD_TABLE)}
+
+class Cards(TypeDecorator):
+    """Card list stored as one byte per card, loaded as a tuple of shared card strings"""
+    impl = LargeBinary
+    cache_ok = True
+    
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        try:
+            return bytes(_CARD_INDEX[card[:-1].upper() + card[-1].lower()] for card in value)
+        except (KeyError, IndexError):
+            raise ValueError(f"Invalid cards: {value}")
+    
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        if isinstance(value, str):
+            # Rows written before the binary encoding still hold JSON text
+            return tuple(json.loads(value))
+        return tuple(_CARD_TABLE[index] for index in value)
+
+class SmallEnum(TypeDecorator):
+    """String from a fixed set of values stored as its SMALLINT position in that set"""
+    impl = SmallInteger
+    cache_ok = True
+    
+    def __init__(self, values: Tuple[str, ...]):
+        super().__init__()
+        self.values = tuple(sys.intern(value) for value in values)
+        self._codes = {value: code for code, value in enumerate(self.values)}
+    
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        try:
+            return self._codes[getattr(value, "value", value)]
+        except KeyError:
+            raise ValueError(f"Invalid value: {value}")
+    
+    def process_result_value(self, value, dialect):
+        if value is None or isinstance(value, str):
+            # Rows written before the integer encoding still hold the string
+            return value
+        return self.values[value]
+
+POSITIONS = tuple(position.value for position in Position)
+ACTIONS = tuple(action.value for action in Action)
+RESULTS = tuple(result.value for result in GameResult)
+
 class GameRecord(Base):
     """Database model for storing game records"""
     __tablename__ = "games"
     
     id = Column(Integer, primary_key=True, index=True)
-    timestamp = Column(DateTime, default=datetime.utcnow, nullable=False)
+    timestamp = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
     pot_size = Column(Float, nullable=False)
     bet_amount = Column(Float, nullable=False)
-    player_cards = Column(Text, nullable=False)  # JSON string
-    community_cards = Column(Text, nullable=False)  # JSON string
-    position = Column(String(20), nullable=False)
+    player_cards = Column(Cards(2), nullable=False)
+    community_cards = Column(Cards(5), nullable=False)
+    position = Column(SmallEnum(POSITIONS), nullable=False)
     num_players = Column(Integer, nullable=False)
-    action_taken = Column(String(20), nullable=False)
-    result = Column(String(20), nullable=False)
+    action_taken = Column(SmallEnum(ACTIONS), nullable=False)
+    result = Column(SmallEnum(RESULTS), nullable=False, index=True)
     profit_loss = Column(Float, nullable=False)
     pot_odds_calculated = Column(Float, nullable=False)
-    equity_calculated = Column(Float, nullable=False)
+    equity_calculated = Column(Float, nullable=False, index=True)
     recommendation_given = Column(Text, nullable=False)
     
     def to_dict(self):
@@ -48,8 +149,8 @@ class GameRecord(Base):
             "timestamp": self.timestamp.isoformat(),
             "pot_size": self.pot_size,
             "bet_amount": self.bet_amount,
-            "player_cards": json.loads(self.player_cards),
-            "community_cards": json.loads(self.community_cards),
+            "player_cards": self.player_cards,
+            "community_cards": self.community_cards,
             "position": self.position,
             "num_players": self.num_players,
             "action_taken": self.action_taken,
@@ -60,6 +161,27 @@ class GameRecord(Base):
             "recommendation_given": self.recommendation_given
         }
 
+# Columns serialized by game history, in to_dict order
+_HISTORY_COLUMNS = (
+    GameRecord.id,
+    GameRecord.timestamp,
+    GameRecord.pot_size,
+    GameRecord.bet_amount,
+    GameRecord.player_cards,
+    GameRecord.community_cards,
+    GameRecord.position,
+    GameRecord.num_players,
+    GameRecord.action_taken,
+    GameRecord.result,
+    GameRecord.profit_loss,
+    GameRecord.pot_odds_calculated,
+    GameRecord.equity_calculated,
+    GameRecord.recommendation_given
+)
+
+# Columns whose storage format changed from text to compact binary/integer codes
+_LEGACY_COLUMNS = ("player_cards", "community_cards", "position", "action_taken", "result")
+
 class StatisticsRecord(Base):
     """Database model for storing statistics"""
     __tablename__ = "statistics"
@@ -94,108 +216,271 @@ def get_db() -> Session:
     finally:
         db.close()
 
+def _has_legacy_games_schema(connection) -> bool:
+    """Whether an existing games table still stores cards and enums in text columns"""
+    inspector = inspect(connection)
+    if not inspector.has_table(GameRecord.__tablename__):
+        return False
+    column_types = {column["name"]: column["type"] for column in inspector.get_columns(GameRecord.__tablename__)}
+    return any(isinstance(column_types.get(name), String) for name in _LEGACY_COLUMNS)
+
+def _decode_legacy_value(column_type, value):
+    """Decode a value read raw from a legacy text column to what the model column accepts"""
+    if value is None:
+        return None
+    if isinstance(column_type, Cards):
+        if isinstance(value, str):
+            return json.loads(value)
+        # Binary cards written into the old schema after the encoding change
+        return [_CARD_TABLE[index] for index in bytes(value)]
+    if isinstance(value, str) and value.isdigit():
+        # Integer codes written into the old schema come back as text
+        return column_type.values[int(value)]
+    if isinstance(value, int):
+        return column_type.values[value]
+    return value
+
+def _migrate_legacy_games(connection) -> int:
+    """Rebuild a legacy games table with the compact column types, re-encoding every row
+
+    create_all never alters an existing table, so the rows are read and checked,
+    the table is dropped and recreated from the model, and the rows reinserted
+    through the column types. Rows are held in memory for the rebuild.
+    """
+    games = GameRecord.__table__
+    legacy = Table(games.name, MetaData(), autoload_with=connection)
+    rows = []
+    for row in connection.execute(select(legacy)).mappings():
+        values = {column.name: row[column.name] for column in games.columns if column.name in row}
+        for name in _LEGACY_COLUMNS:
+            column_type = games.c[name].type
+            raw = values.get(name)
+            try:
+                values[name] = _decode_legacy_value(column_type, raw)
+                # Encode now so a bad row fails before the old table is dropped
+                column_type.process_bind_param(values[name], connection.dialect)
+            except (ValueError, IndexError, KeyError) as e:
+                raise RuntimeError(
+                    f"Cannot migrate {games.name} row id={row.get('id')}: column {name} holds {raw!r}, "
+                    f"which has no compact encoding ({e}). Fix or delete the row and restart; "
+                    f"the table has not been modified"
+                ) from e
+        rows.append(values)
+    
+    legacy.drop(connection)
+    games.create(connection)
+    for start in range(0, len(rows), 1000):
+        connection.execute(games.insert(), rows[start:start + 1000])
+    if rows and connection.dialect.name == "postgresql":
+        # Ids were inserted explicitly, so move the serial sequence past them
+        connection.execute(select(func.setval(func.pg_get_serial_sequence(games.name, "id"), func.max(games.c.id))))
+    return len(rows)
+
 async def init_db():
-    """Initialize database tables"""
-    Base.metadata.create_all(bind=engine)
-    print("✅ Database initialized successfully")
+    """Initialize database tables, migrating a games table from the old text schema first"""
+    with engine.begin() as connection:
+        if _has_legacy_games_schema(connection):
+            migrated = _migrate_legacy_games(connection)
+            logger.info(f"Migrated {migrated} games to the compact column encoding")
+        Base.metadata.create_all(bind=connection)
+    logger.info("Database initialized successfully")
+
+# Statements built once at import; execute() then reuses the cached compiled SQL
+_GAME_HISTORY_STMT = (
+    select(*_HISTORY_COLUMNS)
+    .order_by(GameRecord.timestamp.desc())
+    .limit(bindparam("limit"))
+    .execution_options(yield_per=500)
+)
+_BEST_HANDS_STMT = (
+    select(GameRecord.player_cards)
+    .order_by(GameRecord.equity_calculated.desc())
+    .limit(bindparam("limit"))
+)
+_STATISTICS_AGGREGATE_STMT = select(
+    func.count(GameRecord.id),
+    func.sum(case((GameRecord.result == "win", 1), else_=0)),
+    func.avg(GameRecord.pot_odds_calculated),
+    func.sum(GameRecord.profit_loss),
+    func.sum(case((GameRecord.profit_loss > 0, 1), else_=0)),
+    func.avg(GameRecord.equity_calculated)
+)
+_LATEST_STATISTICS_STMT = select(StatisticsRecord).order_by(StatisticsRecord.id.desc()).limit(1)
+_LATEST_STATISTICS_ID = select(func.max(StatisticsRecord.id)).scalar_subquery()
+_UPDATE_STATISTICS_STMT = (
+    update(StatisticsRecord)
+    .where(StatisticsRecord.id == _LATEST_STATISTICS_ID)
+    .values(
+        # Right-hand sides all see the row's old values, so these are exact running averages
+        total_games=StatisticsRecord.total_games + bindparam("games"),
+        total_hands=StatisticsRecord.total_games + bindparam("games"),
+        win_rate=(StatisticsRecord.win_rate * StatisticsRecord.total_games + bindparam("wins") * 100.0)
+        / (StatisticsRecord.total_games + bindparam("games")),
+        average_pot_odds=(StatisticsRecord.average_pot_odds * StatisticsRecord.total_games + bindparam("pot_odds"))
+        / (StatisticsRecord.total_games + bindparam("games")),
+        average_equity=(StatisticsRecord.average_equity * StatisticsRecord.total_games + bindparam("equity"))
+        / (StatisticsRecord.total_games + bindparam("games")),
+        session_profit=StatisticsRecord.session_profit + bindparam("profit"),
+        profitable_hands=StatisticsRecord.profitable_hands + bindparam("profitable"),
+        recommendation_accuracy=75.0,  # Placeholder
+        timestamp=bindparam("now")
+    )
+    .execution_options(synchronize_session=False)
+)
+_GET_SETTING_STMT = select(SettingsRecord).where(SettingsRecord.key == bindparam("key"))
 
 class DatabaseManager:
     """Manager class for database operations"""
     
-    def __init__(self):
-        self.db = SessionLocal()
+    def __init__(self, db: Optional[Session] = None):
+        # Reuse the caller's pooled session (e.g. from get_db) when given
+        self._owns_session = db is None
+        self.db = db if db is not None else SessionLocal()
     
     def __enter__(self):
         return self.db
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.db.close()
+        if self._owns_session:
+            self.db.close()
+    
+    @staticmethod
+    def _game_values(game_data: dict) -> dict:
+        """Map incoming game data to GameRecord column values"""
+        return {
+            "pot_size": game_data["pot_size"],
+            "bet_amount": game_data["bet_amount"],
+            "player_cards": game_data["player_cards"],
+            "community_cards": game_data["community_cards"],
+            "position": game_data["position"],
+            "num_players": game_data["num_players"],
+            "action_taken": game_data["action_taken"],
+            "result": game_data["result"],
+            "profit_loss": game_data["profit_loss"],
+            "pot_odds_calculated": game_data["pot_odds_calculated"],
+            "equity_calculated": game_data["equity_calculated"],
+            "recommendation_given": game_data["recommendation_given"]
+        }
     
     def save_game(self, game_data: dict) -> int:
         """Save a game record to the database"""
         try:
-            game_record = GameRecord(
-                pot_size=game_data["pot_size"],
-                bet_amount=game_data["bet_amount"],
-                player_cards=json.dumps(game_data["player_cards"]),
-                community_cards=json.dumps(game_data["community_cards"]),
-                position=game_data["position"],
-                num_players=game_data["num_players"],
-                action_taken=game_data["action_taken"],
-                result=game_data["result"],
-                profit_loss=game_data["profit_loss"],
-                pot_odds_calculated=game_data["pot_odds_calculated"],
-                equity_calculated=game_data["equity_calculated"],
-                recommendation_given=game_data["recommendation_given"]
-            )
+            game_record = GameRecord(**self._game_values(game_data))
             
             self.db.add(game_record)
+            self.db.flush()
+            # Same transaction as the insert, so the snapshot can't drift from the games table
+            self._update_statistics([game_data])
             self.db.commit()
-            self.db.refresh(game_record)
             
             return game_record.id
         except Exception as e:
             self.db.rollback()
             raise e
     
+    def save_games_bulk(self, games: List[dict]) -> None:
+        """Save many game records with a single batched INSERT and one commit"""
+        if not games:
+            return
+        try:
+            self.db.bulk_insert_mappings(
+                GameRecord,
+                [self._game_values(game_data) for game_data in games]
+            )
+            self._update_statistics(games)
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            raise e
+    
+    def iter_game_history(self, limit: int = 100) -> Iterator[dict]:
+        """Stream game history from database in fixed-size chunks"""
+        # Core column select skips ORM instance construction and the identity map;
+        # yield_per keeps only one chunk of rows in memory and uses a
+        # server-side cursor on backends that support it
+        for row in self.db.execute(_GAME_HISTORY_STMT, {"limit": limit}).mappings():
+            game = dict(row)
+            game["timestamp"] = game["timestamp"].isoformat()
+            yield game
+    
     def get_game_history(self, limit: int = 100) -> List[dict]:
         """Get game history from database"""
         try:
-            games = self.db.query(GameRecord).order_by(GameRecord.timestamp.desc()).limit(limit).all()
-            return [game.to_dict() for game in games]
+            return list(self.iter_game_history(limit))
         except Exception as e:
             raise e
     
+    def _current_statistics(self) -> Optional[StatisticsRecord]:
+        """Get the latest statistics snapshot row, if any"""
+        return self.db.execute(_LATEST_STATISTICS_STMT).scalar_one_or_none()
+    
+    def _update_statistics(self, games: List[dict]):
+        """Fold newly saved games into the statistics snapshot, without committing"""
+        # One UPDATE computed from the row's current values, so concurrent saves can't
+        # overwrite each other's counts the way a read-modify-write in Python would
+        params = {
+            "games": len(games),
+            "wins": sum(1 for game_data in games if game_data["result"] == "win"),
+            "pot_odds": sum(game_data["pot_odds_calculated"] for game_data in games),
+            "equity": sum(game_data["equity_calculated"] for game_data in games),
+            "profit": sum(game_data["profit_loss"] for game_data in games),
+            "profitable": sum(1 for game_data in games if game_data["profit_loss"] > 0),
+            "now": datetime.utcnow()
+        }
+        if self.db.execute(_UPDATE_STATISTICS_STMT, params).rowcount == 0:
+            # No snapshot yet, build it from the full table (includes these games)
+            self._recompute_statistics()
+    
+    def _recompute_statistics(self) -> StatisticsRecord:
+        """Rebuild the statistics snapshot from the full games table, without committing"""
+        # Compute every aggregate in a single pass over the games table
+        row = self.db.execute(_STATISTICS_AGGREGATE_STMT).one()
+        total_games, wins, avg_pot_odds, session_profit, profitable_hands, avg_equity = row
+        
+        stats = self._current_statistics()
+        if stats is None:
+            stats = StatisticsRecord()
+            self.db.add(stats)
+        
+        stats.timestamp = datetime.utcnow()
+        stats.total_games = total_games
+        stats.total_hands = total_games
+        stats.win_rate = (wins / total_games) * 100 if total_games else 0.0
+        stats.average_pot_odds = avg_pot_odds or 0.0
+        stats.session_profit = session_profit or 0.0
+        stats.profitable_hands = profitable_hands or 0
+        stats.average_equity = avg_equity or 0.0
+        # Calculate recommendation accuracy (simplified)
+        # This would need more sophisticated logic in a real implementation
+        stats.recommendation_accuracy = 75.0 if total_games else 0.0  # Placeholder
+        return stats
+    
+    def refresh_statistics(self) -> StatisticsRecord:
+        """Recompute the statistics snapshot from the full games table"""
+        try:
+            stats = self._recompute_statistics()
+            self.db.commit()
+            return stats
+        except Exception as e:
+            self.db.rollback()
+            raise e
+    
     def get_statistics(self) -> dict:
-        """Calculate and return statistics"""
+        """Return statistics from the precomputed snapshot"""
         try:
-            # Get total games
-            total_games = self.db.query(GameRecord).count()
-            
-            if total_games == 0:
-                return {
-                    "total_games": 0,
-                    "win_rate": 0.0,
-                    "average_pot_odds": 0.0,
-                    "session_profit": 0.0,
-                    "total_hands": 0,
-                    "profitable_hands": 0,
-                    "average_equity": 0.0,
-                    "recommendation_accuracy": 0.0
-                }
-            
-            # Calculate win rate
-            wins = self.db.query(GameRecord).filter(GameRecord.result == "win").count()
-            win_rate = (wins / total_games) * 100
-            
-            # Calculate average pot odds
-            avg_pot_odds = self.db.query(GameRecord.pot_odds_calculated).all()
-            avg_pot_odds = sum([row[0] for row in avg_pot_odds]) / len(avg_pot_odds)
-            
-            # Calculate session profit
-            total_profit = self.db.query(GameRecord.profit_loss).all()
-            session_profit = sum([row[0] for row in total_profit])
-            
-            # Calculate profitable hands
-            profitable_hands = self.db.query(GameRecord).filter(GameRecord.profit_loss > 0).count()
-            
-            # Calculate average equity
-            avg_equity = self.db.query(GameRecord.equity_calculated).all()
-            avg_equity = sum([row[0] for row in avg_equity]) / len(avg_equity)
-            
-            # Calculate recommendation accuracy (simplified)
-            # This would need more sophisticated logic in a real implementation
-            recommendation_accuracy = 75.0  # Placeholder
+            stats = self._current_statistics()
+            if stats is None:
+                stats = self.refresh_statistics()
             
             return {
-                "total_games": total_games,
-                "win_rate": round(win_rate, 2),
-                "average_pot_odds": round(avg_pot_odds, 2),
-                "session_profit": round(session_profit, 2),
-                "total_hands": total_games,
-                "profitable_hands": profitable_hands,
-                "average_equity": round(avg_equity, 2),
-                "recommendation_accuracy": round(recommendation_accuracy, 2)
+                "total_games": stats.total_games,
+                "win_rate": round(stats.win_rate, 2),
+                "average_pot_odds": round(stats.average_pot_odds, 2),
+                "session_profit": round(stats.session_profit, 2),
+                "total_hands": stats.total_hands,
+                "profitable_hands": stats.profitable_hands,
+                "average_equity": round(stats.average_equity, 2),
+                "recommendation_accuracy": round(stats.recommendation_accuracy, 2)
             }
         except Exception as e:
             raise e
@@ -203,37 +488,60 @@ class DatabaseManager:
     def get_best_hands(self, limit: int = 10) -> List[str]:
         """Get the best hands played"""
         try:
-            # Get hands with highest equity
-            best_games = self.db.query(GameRecord).order_by(GameRecord.equity_calculated.desc()).limit(limit).all()
-            return [game.player_cards for game in best_games]
+            # Top-K by equity reading only the card column (walks ix_games_equity_calculated)
+            best_cards = self.db.execute(_BEST_HANDS_STMT, {"limit": limit}).scalars().all()
+            return [json.dumps(cards) for cards in best_cards]
         except Exception as e:
             raise e
     
     def save_setting(self, key: str, value: str, description: Optional[str] = None):
         """Save a setting to the database"""
         try:
-            setting = self.db.query(SettingsRecord).filter(SettingsRecord.key == key).first()
-            if setting:
-                setting.value = value
+            insert = _UPSERT_INSERTS.get(self.db.get_bind().dialect.name)
+            if insert is not None:
+                # Single INSERT ... ON CONFLICT(key) DO UPDATE round trip
+                updates = {"value": value, "updated_at": datetime.utcnow()}
                 if description:
-                    setting.description = description
-            else:
-                setting = SettingsRecord(
+                    updates["description"] = description
+                stmt = insert(SettingsRecord).values(
                     key=key,
                     value=value,
                     description=description
+                ).on_conflict_do_update(
+                    index_elements=[SettingsRecord.key],
+                    set_=updates
                 )
-                self.db.add(setting)
+                self.db.execute(stmt)
+            else:
+                setting = self.db.execute(_GET_SETTING_STMT, {"key": key}).scalar_one_or_none()
+                if setting:
+                    setting.value = value
+                    if description:
+                        setting.description = description
+                else:
+                    setting = SettingsRecord(
+                        key=key,
+                        value=value,
+                        description=description
+                    )
+                    self.db.add(setting)
             
             self.db.commit()
+            _settings_cache.pop(key, None)
         except Exception as e:
             self.db.rollback()
             raise e
     
     def get_setting(self, key: str) -> Optional[str]:
         """Get a setting from the database"""
+        cached = _settings_cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < SETTINGS_CACHE_TTL:
+            return cached[1]
+        
         try:
-            setting = self.db.query(SettingsRecord).filter(SettingsRecord.key == key).first()
-            return setting.value if setting else None
+            setting = self.db.execute(_GET_SETTING_STMT, {"key": key}).scalar_one_or_none()
+            value = setting.value if setting else None
+            _settings_cache[key] = (time.monotonic(), value)
+            return value
         except Exception as e:
             raise e 
\ No newline at end of file
@@ -1,42 +1,54 @@
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
 from fastapi.staticfiles import StaticFiles
-from contextlib import asynccontextmanager
+from fastapi.responses import StreamingResponse, ORJSONResponse
+from sqlalchemy.orm import Session
+from contextlib import asynccontextmanager, suppress
 import uvicorn
-from typing import List, Dict, Any
-import json
+from typing import Dict, Any, Iterator, Set
+from itertools import chain
+import orjson
 import asyncio
+import logging
+import os
 
-from app.poker_engine import PokerEngine
+from app.poker_engine import PokerEngine, shutdown_simulation_pool
 from app.models import (
     PotOddsRequest, 
     PotOddsResponse, 
     HandEvaluationRequest, 
     HandEvaluationResponse,
+    ProbabilityRequest,
     GameHistory,
     GameData
 )
-from app.database import get_db, init_db
+from app.database import get_db, init_db, DatabaseManager
 from app.screen_capture import ScreenCapture
 
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper())
+logger = logging.getLogger(__name__)
+
 # Global variables
 poker_engine = PokerEngine()
-active_connections: List[WebSocket] = []
+active_connections: Set[WebSocket] = set()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     await init_db()
-    print("🚀 Pot Logic Poker Bot started!")
+    logger.info("Pot Logic Poker Bot started")
     yield
     # Shutdown
-    print("👋 Pot Logic Poker Bot shutting down...")
+    shutdown_simulation_pool()
+    logger.info("Pot Logic Poker Bot shutting down")
 
 app = FastAPI(
     title="Pot Logic - Advanced Poker Bot",
     description="A comprehensive poker bot with pot odds calculation and real-time analysis",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -89,106 +101,139 @@ async def evaluate_hand(request: HandEvaluationRequest):
         raise HTTPException(status_code=400, detail=str(e))
 
 @app.post("/api/calculate-probabilities")
-async def calculate_probabilities(request: Dict[str, Any]):
+async def calculate_probabilities(request: ProbabilityRequest):
     """Calculate winning probabilities for different scenarios"""
     try:
-        result = poker_engine.calculate_probabilities(
-            player_cards=request.get("player_cards", []),
-            community_cards=request.get("community_cards", []),
-            num_players=request.get("num_players", 2),
-            num_simulations=request.get("num_simulations", 10000)
+        # Simulations are CPU-bound (numba's parallel kernel, or the process pool without numba); run them off the event loop
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(
+            None,
+            poker_engine.calculate_probabilities,
+            request.player_cards,
+            request.community_cards or [],
+            request.num_players,
+            request.num_simulations,
+            request.tolerance
         )
         return result
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+def _stream_game_history(manager: DatabaseManager, games: Iterator[dict]):
+    """Yield game history as newline-delimited JSON, one game per line, then close the session"""
+    with manager:
+        for game in games:
+            yield orjson.dumps(game) + b"\n"
+
 @app.get("/api/game-history")
-async def get_game_history():
-    """Retrieve game history from database"""
-    db = get_db()
+def get_game_history(limit: int = 100):
+    """Retrieve game history from database as an NDJSON stream"""
+    manager = DatabaseManager()
     try:
-        # This would be implemented with actual database queries
-        return {"games": [], "total_games": 0}
+        # Run the query and fetch the first row here, so connection and query errors
+        # still produce a 500; once streaming starts the status line is already sent
+        games = manager.iter_game_history(limit)
+        first = next(games, None)
     except Exception as e:
+        manager.db.close()
         raise HTTPException(status_code=500, detail=str(e))
+    rows = games if first is None else chain((first,), games)
+    return StreamingResponse(_stream_game_history(manager, rows), media_type="application/x-ndjson")
 
 @app.post("/api/save-game")
-async def save_game(game_data: GameData):
+async def save_game(game_data: GameData, db: Session = Depends(get_db)):
     """Save game data to database"""
-    db = get_db()
     try:
-        # This would be implemented with actual database operations
-        return {"message": "Game saved successfully", "game_id": "123"}
+        # The commit blocks; keep it off the event loop that serves the WebSocket clients
+        game_id = await run_in_threadpool(DatabaseManager(db).save_game, game_data.model_dump(mode="json"))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    # Statistics and history changed for every open dashboard
+    await broadcast("game_saved", {"game_id": game_id})
+    return {"message": "Game saved successfully", "game_id": game_id}
+
+async def broadcast(message_type: str, data: Dict[str, Any]):
+    """Send one message to every connected WebSocket client"""
+    # Encode once and fan out concurrently; a failing client doesn't block the others
+    payload = orjson.dumps({"type": message_type, "data": data})
+    connections = list(active_connections)
+    results = await asyncio.gather(
+        *(connection.send_bytes(payload) for connection in connections),
+        return_exceptions=True
+    )
+    # Drop clients whose send failed; they are closed or closing
+    for connection, result in zip(connections, results):
+        if isinstance(result, Exception):
+            active_connections.discard(connection)
 
 @app.websocket("/ws/poker-analysis")
 async def websocket_endpoint(websocket: WebSocket):
     """WebSocket endpoint for real-time poker analysis"""
     await websocket.accept()
-    active_connections.append(websocket)
+    active_connections.add(websocket)
     
     try:
         while True:
             # Receive data from client
             data = await websocket.receive_text()
-            message = json.loads(data)
+            message = orjson.loads(data)
             
             # Process the message based on type
             if message.get("type") == "pot_odds_request":
+                request = PotOddsRequest.model_validate(message)
                 result = poker_engine.calculate_pot_odds(
-                    pot_size=message["pot_size"],
-                    bet_to_call=message["bet_to_call"],
-                    player_cards=message.get("player_cards", []),
-                    community_cards=message.get("community_cards", []),
-                    position=message.get("position", "unknown"),
-                    num_players=message.get("num_players", 2)
+                    pot_size=request.pot_size,
+                    bet_to_call=request.bet_to_call,
+                    player_cards=request.player_cards,
+                    community_cards=request.community_cards,
+                    position=request.position,
+                    num_players=request.num_players
                 )
                 
                 # Send response back to client
-                await websocket.send_text(json.dumps({
+                await websocket.send_text(orjson.dumps({
                     "type": "pot_odds_response",
                     "data": result
-                }))
+                }).decode())
             
             elif message.get("type") == "hand_evaluation_request":
+                request = HandEvaluationRequest.model_validate(message)
                 result = poker_engine.evaluate_hand(
-                    player_cards=message["player_cards"],
-                    community_cards=message.get("community_cards", [])
+                    player_cards=request.player_cards,
+                    community_cards=request.community_cards
                 )
                 
-                await websocket.send_text(json.dumps({
+                await websocket.send_text(orjson.dumps({
                     "type": "hand_evaluation_response",
                     "data": result
-                }))
+                }).decode())
             
             elif message.get("type") == "start_screen_capture":
                 # Future implementation for screen capture
-                await websocket.send_text(json.dumps({
+                await websocket.send_text(orjson.dumps({
                     "type": "screen_capture_status",
                     "status": "not_implemented_yet"
-                }))
+                }).decode())
                 
     except WebSocketDisconnect:
-        active_connections.remove(websocket)
+        pass
     except Exception as e:
-        await websocket.send_text(json.dumps({
-            "type": "error",
-            "message": str(e)
-        }))
+        # The handler is ending either way; report the error if the socket still accepts it
+        with suppress(Exception):
+            await websocket.send_text(orjson.dumps({
+                "type": "error",
+                "message": str(e)
+            }).decode())
+    finally:
+        active_connections.discard(websocket)
 
 @app.get("/api/statistics")
-async def get_statistics():
+def get_statistics(db: Session = Depends(get_db)):
     """Get poker statistics and performance metrics"""
     try:
-        # This would calculate actual statistics from database
-        stats = {
-            "total_games": 0,
-            "win_rate": 0.0,
-            "average_pot_odds": 0.0,
-            "best_hands": [],
-            "session_profit": 0.0
-        }
+        manager = DatabaseManager(db)
+        stats = manager.get_statistics()
+        stats["best_hands"] = manager.get_best_hands()
         return stats
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
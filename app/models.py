@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from enum import Enum
@@ -13,8 +13,23 @@ class Position(str, Enum):
     BIG_BLIND = "big_blind"
     UNKNOWN = "unknown"
 
+class Action(str, Enum):
+    """Actions a player can take"""
+    FOLD = "fold"
+    CALL = "call"
+    RAISE = "raise"
+
+class GameResult(str, Enum):
+    """Outcomes of a hand"""
+    WIN = "win"
+    LOSE = "lose"
+    TIE = "tie"
+
 class PotOddsRequest(BaseModel):
     """Request model for pot odds calculation"""
+    # Requests are read-only once parsed; unknown keys (e.g. WebSocket "type") are dropped
+    model_config = ConfigDict(frozen=True, extra='ignore')
+    
     pot_size: float = Field(..., gt=0, description="Current pot size")
     bet_to_call: float = Field(..., ge=0, description="Amount needed to call")
     player_cards: Optional[List[str]] = Field(default=None, description="Player's hole cards")
@@ -35,6 +50,8 @@ class PotOddsResponse(BaseModel):
 
 class HandEvaluationRequest(BaseModel):
     """Request model for hand evaluation"""
+    model_config = ConfigDict(frozen=True, extra='ignore')
+    
     player_cards: List[str] = Field(..., min_items=2, max_items=2, description="Player's hole cards")
     community_cards: Optional[List[str]] = Field(default=None, description="Community cards on board")
 
@@ -50,10 +67,13 @@ class HandEvaluationResponse(BaseModel):
 
 class ProbabilityRequest(BaseModel):
     """Request model for probability calculation"""
+    model_config = ConfigDict(frozen=True, extra='ignore')
+    
     player_cards: List[str] = Field(..., min_items=2, max_items=2, description="Player's hole cards")
     community_cards: Optional[List[str]] = Field(default=None, description="Community cards on board")
     num_players: int = Field(default=2, ge=2, le=10, description="Number of players")
-    num_simulations: int = Field(default=10000, ge=1000, le=100000, description="Number of Monte Carlo simulations")
+    num_simulations: int = Field(default=1000, ge=1000, le=100000, description="Number of Monte Carlo simulations")
+    tolerance: Optional[float] = Field(default=None, gt=0, lt=1, description="Stop early once the 95% interval on win probability is narrower than this")
 
 class ProbabilityResponse(BaseModel):
     """Response model for probability calculation"""
@@ -70,8 +90,8 @@ class GameData(BaseModel):
     community_cards: List[str] = Field(..., description="Community cards")
     position: Position = Field(..., description="Player's position")
     num_players: int = Field(..., description="Number of players")
-    action_taken: str = Field(..., description="Action taken (fold/call/raise)")
-    result: str = Field(..., description="Result of the hand (win/lose/tie)")
+    action_taken: Action = Field(..., description="Action taken (fold/call/raise)")
+    result: GameResult = Field(..., description="Result of the hand (win/lose/tie)")
     profit_loss: float = Field(..., description="Profit or loss from the hand")
     pot_odds_calculated: float = Field(..., description="Pot odds that were calculated")
     equity_calculated: float = Field(..., description="Equity that was calculated")
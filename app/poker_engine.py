@@ -1,13 +1,49 @@
-import random
 import math
-from typing import List, Dict, Any, Tuple, Optional
+import multiprocessing
+import os
+import threading
+from bisect import bisect_left
+from collections import Counter
+from functools import lru_cache
+from itertools import combinations
+from pathlib import Path
+from typing import List, Dict, Any, Tuple, Optional, Sequence
 from enum import Enum
+from types import MappingProxyType
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba is optional; fall back to the NumPy simulation
+    NUMBA_AVAILABLE = False
+
+_RANK_VALUE = {
+    '2': 2, '3': 3, '4': 4, '5': 5, '6': 6, '7': 7, '8': 8, '9': 9,
+    '10': 10, 'J': 11, 'Q': 12, 'K': 13, 'A': 14
+}
+_RANKS = frozenset(_RANK_VALUE)
+_SUITS = frozenset(('h', 'd', 'c', 's'))
 
 class Card:
-    """Represents a playing card"""
+    """Represents a playing card; immutable, so parsed cards can be shared between callers"""
+    __slots__ = ('rank', 'suit', 'value')
+    
     def __init__(self, rank: str, suit: str):
-        self.rank = rank
-        self.suit = suit
+        object.__setattr__(self, 'rank', rank)
+        object.__setattr__(self, 'suit', suit)
+        object.__setattr__(self, 'value', _RANK_VALUE.get(rank, 0))
+    
+    def __setattr__(self, name, value):
+        raise AttributeError("Card is immutable")
+    
+    def __delattr__(self, name):
+        raise AttributeError("Card is immutable")
+    
+    def __reduce__(self):
+        return (Card, (self.rank, self.suit))
         
     def __str__(self):
         return f"{self.rank}{self.suit}"
@@ -17,11 +53,19 @@ class Card:
     
     def get_value(self) -> int:
         """Get numerical value of card for comparison"""
-        values = {
-            '2': 2, '3': 3, '4': 4, '5': 5, '6': 6, '7': 7, '8': 8, '9': 9,
-            '10': 10, 'J': 11, 'Q': 12, 'K': 13, 'A': 14
-        }
-        return values.get(self.rank, 0)
+        return self.value
+
+@lru_cache(maxsize=1024)
+def _parse_cards_tuple(card_strings: Tuple[str, ...]) -> Tuple[Card, ...]:
+    """Parse card strings into Cards, skipping invalid ones; cached since the same hands recur"""
+    cards = []
+    for card_str in card_strings:
+        if len(card_str) >= 2:
+            rank = card_str[:-1]
+            suit = card_str[-1].lower()
+            if rank in _RANKS and suit in _SUITS:
+                cards.append(Card(rank, suit))
+    return tuple(cards)
 
 class HandRank(Enum):
     """Poker hand rankings"""
@@ -36,23 +80,544 @@ class HandRank(Enum):
     STRAIGHT_FLUSH = 9
     ROYAL_FLUSH = 10
 
+# Cactus Kev card encoding: xxxbbbbb bbbbbbbb cdhsrrrr xxpppppp
+# (b = rank bit, cdhs = suit bit, r = rank ordinal, p = rank prime)
+_PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+_SUIT_BITS = {'c': 0x8000, 'd': 0x4000, 'h': 0x2000, 's': 0x1000}
+
+CARD_INTS = {
+    rank + suit: (1 << (16 + r)) | suit_bit | (r << 8) | _PRIMES[r]
+    for r, rank in enumerate(_RANK_VALUE)
+    for suit, suit_bit in _SUIT_BITS.items()
+}
+
+# Per-suit counters live in separate nibbles; adding 3 sets a nibble's top bit once it reaches 5
+_SUIT_COUNT_STEP = {0x1000: 0x0001, 0x2000: 0x0010, 0x4000: 0x0100, 0x8000: 0x1000}
+_FLUSH_SUIT = {0x0008: 0x1000, 0x0080: 0x2000, 0x0800: 0x4000, 0x8000: 0x8000}
+
+# Worst hand value of each category (1 = royal flush ... 7462 = 7-5-4-3-2 offsuit)
+_CATEGORY_LIMITS = (1, 10, 166, 322, 1599, 1609, 2467, 3325, 6185, 7462)
+_CATEGORY_RANKS = (
+    HandRank.ROYAL_FLUSH, HandRank.STRAIGHT_FLUSH, HandRank.FOUR_OF_A_KIND,
+    HandRank.FULL_HOUSE, HandRank.FLUSH, HandRank.STRAIGHT, HandRank.THREE_OF_A_KIND,
+    HandRank.TWO_PAIR, HandRank.PAIR, HandRank.HIGH_CARD
+)
+
+
+def _build_rank_tables() -> Tuple[List[int], Dict[int, int]]:
+    """Enumerate the 7462 five-card hand classes and extend them to 6 and 7 cards
+
+    Returns a flush table indexed by the 13-bit rank set of the flush suit and a
+    dict from prime product to hand value for everything else.
+    """
+    flush_ranks = [0] * 8192
+    five_card = {}
+    desc = range(12, -1, -1)
+
+    def product(mask: int) -> int:
+        p = 1
+        for r in range(13):
+            if mask >> r & 1:
+                p *= _PRIMES[r]
+        return p
+
+    # Ace-high straight first, the wheel (A-2-3-4-5) last
+    straights = [0x1F << shift for shift in range(8, -1, -1)] + [0x100F]
+    straight_set = set(straights)
+    distinct = [
+        mask for mask in (sum(1 << r for r in combo) for combo in combinations(desc, 5))
+        if mask not in straight_set
+    ]
+
+    value = 1
+    for mask in straights:
+        flush_ranks[mask] = value
+        value += 1
+    for quad in desc:
+        for kicker in desc:
+            if kicker != quad:
+                five_card[_PRIMES[quad] ** 4 * _PRIMES[kicker]] = value
+                value += 1
+    for trips in desc:
+        for pair in desc:
+            if pair != trips:
+                five_card[_PRIMES[trips] ** 3 * _PRIMES[pair] ** 2] = value
+                value += 1
+    for mask in distinct:
+        flush_ranks[mask] = value
+        value += 1
+    for mask in straights:
+        five_card[product(mask)] = value
+        value += 1
+    for trips in desc:
+        for k1, k2 in combinations([r for r in desc if r != trips], 2):
+            five_card[_PRIMES[trips] ** 3 * _PRIMES[k1] * _PRIMES[k2]] = value
+            value += 1
+    for high, low in combinations(desc, 2):
+        for kicker in desc:
+            if kicker != high and kicker != low:
+                five_card[_PRIMES[high] ** 2 * _PRIMES[low] ** 2 * _PRIMES[kicker]] = value
+                value += 1
+    for pair in desc:
+        for k1, k2, k3 in combinations([r for r in desc if r != pair], 3):
+            five_card[_PRIMES[pair] ** 2 * _PRIMES[k1] * _PRIMES[k2] * _PRIMES[k3]] = value
+            value += 1
+    for mask in distinct:
+        five_card[product(mask)] = value
+        value += 1
+
+    # A 6 or 7 card hand is worth its best 5-card subset; build each size from the one below
+    product_ranks = dict(five_card)
+    level = five_card
+    for _ in range(2):
+        next_level = {}
+        for p, best in level.items():
+            for prime in _PRIMES:
+                if p % prime ** 4 == 0:
+                    continue  # only four cards of each rank
+                q = p * prime
+                if best < next_level.get(q, 7463):
+                    next_level[q] = best
+        product_ranks.update(next_level)
+        level = next_level
+
+    for size in (6, 7):
+        for mask in range(8192):
+            if bin(mask).count("1") == size:
+                best = 7463
+                rest = mask
+                while rest:
+                    bit = rest & -rest
+                    best = min(best, flush_ranks[mask ^ bit])
+                    rest ^= bit
+                flush_ranks[mask] = best
+
+    return flush_ranks, product_ranks
+
+
+def _cactus_rank(cards: Sequence[int]) -> int:
+    """Value of the best 5-card hand in 5-7 encoded cards; lower is stronger"""
+    suit_counts = 0
+    product = 1
+    for card in cards:
+        suit_counts += _SUIT_COUNT_STEP[card & 0xF000]
+        product *= card & 0xFF
+
+    flush = (suit_counts + 0x3333) & 0x8888
+    if flush:
+        # With 7 cards a flush rules out quads and full houses
+        suit_bit = _FLUSH_SUIT[flush]
+        rank_set = 0
+        for card in cards:
+            if card & suit_bit:
+                rank_set |= card >> 16
+        return _FLUSH_RANKS[rank_set]
+
+    return _PRODUCT_RANKS[product]
+
+
+def _cactus_category(value: int) -> HandRank:
+    """Map a Cactus Kev hand value back to its HandRank"""
+    return _CATEGORY_RANKS[bisect_left(_CATEGORY_LIMITS, value)]
+
+
+# PCG64 generator for the NumPy simulation; spawned workers each seed their own on import
+_RNG = np.random.default_rng()
+
+# Card ids 0..51 index the same deck order as CARD_INTS
+CARD_IDS = {name: card_id for card_id, name in enumerate(CARD_INTS)}
+_CARD_ID_INTS = np.array(list(CARD_INTS.values()), dtype=np.int64)
+
+
+def _build_rank_state_table(product_ranks: Dict[int, int]) -> Tuple[np.ndarray, np.ndarray]:
+    """Build a transition table over rank multisets of up to 7 cards
+
+    Each state is a multiset of ranks, identified by its prime product and
+    numbered in product order, so state 0 is the empty hand. Walking
+    ``state = transitions[state, rank]`` once per card replaces the product
+    and hash lookup. ``values[state]`` is the best non-flush hand value, or 0
+    below five cards.
+    """
+    primes = np.array(_PRIMES, dtype=np.int64)
+    levels = [np.array([1], dtype=np.int64)]
+    for _ in range(7):
+        products = np.unique((levels[-1][:, None] * primes).ravel())
+        # Drop multisets holding a fifth card of any rank
+        levels.append(products[np.all(products[:, None] % primes ** 5 != 0, axis=1)])
+
+    # Different hand sizes never share a product, so one sorted array numbers every state
+    keys = np.sort(np.concatenate(levels))
+    successors = keys[:, None] * primes
+    index = np.searchsorted(keys, successors).clip(max=keys.size - 1)
+    transitions = np.where(keys[index] == successors, index, 0).astype(np.int32)
+    values = np.array([product_ranks.get(key, 0) for key in keys.tolist()], dtype=np.int16)
+    return transitions, values
+
+
+# Built tables are saved here and memory-mapped by later processes (tests, uvicorn --reload restarts)
+TABLE_CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "potlogics"
+# Bump whenever the table layout or hand numbering changes so stale caches are ignored
+_TABLE_CACHE_VERSION = 1
+_TABLE_NAMES = ("flush", "product_keys", "product_values", "rank_states", "state_values")
+
+
+def _build_tables() -> Dict[str, np.ndarray]:
+    """Build every lookup table the evaluators use, as fixed-dtype arrays"""
+    flush_ranks, product_ranks = _build_rank_tables()
+    rank_states, state_values = _build_rank_state_table(product_ranks)
+    return {
+        "flush": np.array(flush_ranks, dtype=np.int16),
+        "product_keys": np.fromiter(product_ranks.keys(), dtype=np.int64, count=len(product_ranks)),
+        "product_values": np.fromiter(product_ranks.values(), dtype=np.int16, count=len(product_ranks)),
+        "rank_states": rank_states,
+        "state_values": state_values,
+    }
+
+
+def _load_tables() -> Dict[str, np.ndarray]:
+    """Memory-map the cached lookup tables, building and caching them if they are missing
+
+    The arrays are read-only either way, so the numba kernel sees one signature.
+    An unwritable cache directory only costs rebuilding the tables on each import.
+    """
+    paths = {name: TABLE_CACHE_DIR / f"{name}-v{_TABLE_CACHE_VERSION}.npy" for name in _TABLE_NAMES}
+    try:
+        return {name: np.load(path, mmap_mode="r") for name, path in paths.items()}
+    except (OSError, ValueError):
+        pass  # missing or truncated; rebuild below
+
+    tables = _build_tables()
+    try:
+        TABLE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        for name, path in paths.items():
+            # Write under a private name and rename, so concurrent imports never load a partial file
+            tmp = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npy")
+            np.save(tmp, tables[name])
+            os.replace(tmp, path)
+    except OSError:
+        pass
+    for table in tables.values():
+        table.flags.writeable = False
+    return tables
+
+
+_TABLES = _load_tables()
+_FLUSH_TABLE = _TABLES["flush"]
+_RANK_STATES = _TABLES["rank_states"]
+_STATE_VALUES = _TABLES["state_values"]
+# The scalar evaluator indexes Python containers, which beat array indexing one card at a time
+_FLUSH_RANKS = _FLUSH_TABLE.tolist()
+_PRODUCT_RANKS = dict(zip(_TABLES["product_keys"].tolist(), _TABLES["product_values"].tolist()))
+
+
+@lru_cache(maxsize=131072)
+def _cactus_rank_cached(card_ids: Tuple[int, ...]) -> int:
+    """_cactus_rank keyed on a sorted tuple of card ids, so repeated hands skip evaluation"""
+    return _cactus_rank(_CARD_ID_INTS[list(card_ids)].tolist())
+
+
+def _cactus_rank_batch(ids: np.ndarray) -> np.ndarray:
+    """Vectorized _cactus_rank over an (n, 7) array of card ids"""
+    # Card ids run rank-major: the rank is id // 4 and the suit is id modulo 4
+    state = np.zeros(ids.shape[0], dtype=np.int32)
+    for column in (ids >> 2).T:
+        state = _RANK_STATES[state, column]
+    values = _STATE_VALUES[state]
+
+    cards = _CARD_ID_INTS[ids]
+    suits = ids & 3
+    suit_counts = (suits[:, :, None] == np.arange(4)).sum(axis=1)
+    flush_suit = suit_counts.argmax(axis=1)
+    is_flush = suit_counts.max(axis=1) >= 5
+    if is_flush.any():
+        rank_bits = np.where(suits == flush_suit[:, None], cards >> 16, 0)
+        flush_values = _FLUSH_TABLE[np.bitwise_or.reduce(rank_bits, axis=1)]
+        values = np.where(is_flush, flush_values, values)
+    return values
+
+
+# Deals generated per vectorized batch; bounds the key and deal arrays regardless of num_simulations
+DEAL_CHUNK = 16384
+
+
+def _simulate_deals(
+    hole_ids: np.ndarray,
+    board_ids: np.ndarray,
+    remaining: np.ndarray,
+    n_opp: int,
+    num_simulations: int
+) -> Tuple[int, int]:
+    """Count (wins, ties) over num_simulations vectorized deals from remaining, DEAL_CHUNK at a time"""
+    wins = ties = 0
+    for start in range(0, num_simulations, DEAL_CHUNK):
+        chunk_wins, chunk_ties = _simulate_deal_chunk(
+            hole_ids, board_ids, remaining, n_opp, min(DEAL_CHUNK, num_simulations - start)
+        )
+        wins += chunk_wins
+        ties += chunk_ties
+    return wins, ties
+
+
+def _simulate_deal_chunk(
+    hole_ids: np.ndarray,
+    board_ids: np.ndarray,
+    remaining: np.ndarray,
+    n_opp: int,
+    num_simulations: int
+) -> Tuple[int, int]:
+    """Count (wins, ties) over one batch of num_simulations deals, all generated at once"""
+    to_deal = 5 - len(board_ids)
+    needed = to_deal + 2 * n_opp
+
+    # Deal the whole batch at once: the `needed` smallest random keys per row pick the
+    # cards, and sorting those keys puts them in random order
+    keys = _RNG.random((num_simulations, remaining.size), dtype=np.float32)
+    picks = np.argpartition(keys, needed, axis=1)[:, :needed]
+    order = np.argsort(np.take_along_axis(keys, picks, axis=1), axis=1)
+    deals = remaining[np.take_along_axis(picks, order, axis=1)]
+
+    board = np.concatenate(
+        [np.broadcast_to(np.array(board_ids, dtype=np.int8), (num_simulations, len(board_ids))),
+         deals[:, :to_deal]],
+        axis=1
+    )
+    if to_deal:
+        hole = np.broadcast_to(np.array(hole_ids, dtype=np.int8), (num_simulations, 2))
+        player = _cactus_rank_batch(np.concatenate([hole, board], axis=1))
+    else:
+        # On the river the player's hand never changes, so rank it once
+        player = _cactus_rank_batch(np.concatenate([hole_ids, board_ids]).astype(np.int8)[None, :])[0]
+
+    # Rank every opponent hand in one batch, then keep the strongest per simulation
+    if n_opp:
+        opponent_hands = np.concatenate(
+            [deals[:, to_deal:needed].reshape(num_simulations, n_opp, 2),
+             np.broadcast_to(board[:, None, :], (num_simulations, n_opp, 5))],
+            axis=2
+        )
+        opponent_ranks = _cactus_rank_batch(opponent_hands.reshape(-1, 7))
+        best_opponent = opponent_ranks.reshape(num_simulations, n_opp).min(axis=1)
+    else:
+        best_opponent = np.full(num_simulations, 7463, dtype=np.int16)
+
+    wins = int((player < best_opponent).sum())
+    ties = int((player == best_opponent).sum())
+    return wins, ties
+
+
+# Deals per batch between early-stopping checks in calculate_probabilities
+EARLY_STOP_BATCH = 200
+
+
+def _wilson_half_width(successes: int, trials: int, z: float = 1.96) -> float:
+    """Half-width of the Wilson score interval for successes / trials"""
+    p = successes / trials
+    z2 = z * z
+    return z * math.sqrt(p * (1 - p) / trials + z2 / (4 * trials * trials)) / (1 + z2 / trials)
+
+
+# Simulations below this size run inline; splitting them costs more in IPC than it saves
+PARALLEL_MIN_SIMULATIONS = 2000
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+# Set by the pool initializer, so a worker never fans its own chunk out again. Checking for a parent
+# process instead would also match uvicorn's server process under --reload or --workers
+_in_pool_worker = False
+
+
+def _mark_pool_worker() -> None:
+    """Pool initializer: flag this process as a simulation worker"""
+    global _in_pool_worker
+    _in_pool_worker = True
+
+
+def _simulation_pool() -> ProcessPoolExecutor:
+    """Return the shared worker pool, starting it on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Spawn rather than fork: a forked child inherits numba's thread pool and can hang
+            _pool = ProcessPoolExecutor(
+                max_workers=os.cpu_count(),
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_mark_pool_worker
+            )
+        return _pool
+
+
+def shutdown_simulation_pool() -> None:
+    """Stop the shared worker pool if it was started"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False)
+            _pool = None
+
+
+# Deals per prange iteration in _mc_kernel; buffers are allocated once per block
+KERNEL_BLOCK = 256
+
+# Serializes calls into the parallel kernel from request threads
+_kernel_lock = threading.Lock()
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _eval7(hand, flush_table, rank_states, state_values):
+        """Jitted _cactus_rank for an array of seven encoded cards"""
+        suit_counts = 0
+        state = 0
+        for card in hand:
+            suit_counts += 1 << (4 * (((card >> 13) & 1) + 2 * ((card >> 14) & 1) + 3 * ((card >> 15) & 1)))
+            state = rank_states[state, (card >> 8) & 0xF]
+
+        for nibble in range(4):
+            if (suit_counts >> (4 * nibble)) & 0xF >= 5:
+                suit_bit = 0x1000 << nibble
+                rank_set = 0
+                for card in hand:
+                    if card & suit_bit:
+                        rank_set |= card >> 16
+                return flush_table[rank_set]
+
+        return state_values[state]
+
+    @njit(parallel=True, cache=True)
+    def _mc_kernel(hole, board, n_opp, n_sims, card_ints, flush_table, rank_states, state_values):
+        """Count (wins, ties) for hole against n_opp random hands over n_sims deals"""
+        known = np.zeros(52, np.bool_)
+        known[hole[0]] = True
+        known[hole[1]] = True
+        for card in board:
+            known[card] = True
+        remaining = np.empty(52 - 2 - board.size, np.int8)
+        n = 0
+        for card_id in range(52):
+            if not known[card_id]:
+                remaining[n] = card_id
+                n += 1
+
+        to_deal = 5 - board.size
+        needed = to_deal + 2 * n_opp
+        n_blocks = (n_sims + KERNEL_BLOCK - 1) // KERNEL_BLOCK
+        counts = np.zeros((n_blocks, 2), np.int64)
+
+        # On the river the player's hand never changes, so rank it once
+        river_rank = 0
+        if to_deal == 0:
+            river_hand = np.empty(7, np.int64)
+            river_hand[0] = card_ints[hole[0]]
+            river_hand[1] = card_ints[hole[1]]
+            for k in range(5):
+                river_hand[2 + k] = card_ints[board[k]]
+            river_rank = _eval7(river_hand, flush_table, rank_states, state_values)
+        for block in prange(n_blocks):
+            # Each block reuses one deck and hand buffer. A partial Fisher-Yates pass
+            # draws uniformly whatever order the deck was left in, so it's never reset
+            deck = remaining.copy()
+            hand = np.empty(7, np.int64)
+            for k in range(board.size):
+                hand[2 + k] = card_ints[board[k]]
+
+            for _ in range(min(KERNEL_BLOCK, n_sims - block * KERNEL_BLOCK)):
+                # One draw of `needed` cards, sliced into board completion and opponent hands
+                for i in range(needed):
+                    j = i + np.random.randint(n - i)
+                    card = deck[i]
+                    deck[i] = deck[j]
+                    deck[j] = card
+
+                if to_deal:
+                    for k in range(to_deal):
+                        hand[2 + board.size + k] = card_ints[deck[k]]
+                    hand[0] = card_ints[hole[0]]
+                    hand[1] = card_ints[hole[1]]
+                    player = _eval7(hand, flush_table, rank_states, state_values)
+                else:
+                    player = river_rank
+
+                best_opponent = 7463
+                for opponent in range(n_opp):
+                    hand[0] = card_ints[deck[to_deal + 2 * opponent]]
+                    hand[1] = card_ints[deck[to_deal + 2 * opponent + 1]]
+                    value = _eval7(hand, flush_table, rank_states, state_values)
+                    if value < best_opponent:
+                        best_opponent = value
+
+                if player < best_opponent:
+                    counts[block, 0] += 1
+                elif player == best_opponent:
+                    counts[block, 1] += 1
+        return counts[:, 0].sum(), counts[:, 1].sum()
+
+    # Compile (or load from cache) at import rather than on the first request
+    _mc_kernel(np.array([0, 1], dtype=np.int8), np.empty(0, dtype=np.int8), 1, 1,
+               _CARD_ID_INTS, _FLUSH_TABLE, _RANK_STATES, _STATE_VALUES)
+
+
+# Coarse equity per hand category, used when no simulation is run
+_RANK_EQUITY = MappingProxyType({
+    HandRank.ROYAL_FLUSH: 95.0,
+    HandRank.STRAIGHT_FLUSH: 90.0,
+    HandRank.FOUR_OF_A_KIND: 85.0,
+    HandRank.FULL_HOUSE: 80.0,
+    HandRank.FLUSH: 75.0,
+    HandRank.STRAIGHT: 70.0,
+    HandRank.THREE_OF_A_KIND: 65.0,
+    HandRank.TWO_PAIR: 60.0,
+    HandRank.PAIR: 55.0,
+    HandRank.HIGH_CARD: 50.0
+})
+
+# Base strength percentage indexed by HandRank.value (HIGH_CARD = 1 ... ROYAL_FLUSH = 10)
+_HAND_BASE_PCT = (50.0, 50.0, 60.0, 65.0, 70.0, 75.0, 80.0, 85.0, 90.0, 95.0, 100.0)
+
+_POSITION_MULT = MappingProxyType({
+    "button": 1.2,
+    "cutoff": 1.1,
+    "middle": 1.0,
+    "early": 0.9,
+    "blinds": 1.0
+})
+
+# Display name indexed by rank value (2..14)
+_RANK_NAMES = tuple(str(value) for value in range(11)) + ("Jack", "Queen", "King", "Ace")
+
+_HAND_DESCRIPTIONS = MappingProxyType({
+    HandRank.ROYAL_FLUSH: "Royal Flush",
+    HandRank.STRAIGHT_FLUSH: "{value}-high Straight Flush",
+    HandRank.FOUR_OF_A_KIND: "Four {value}s",
+    HandRank.FULL_HOUSE: "Full House, {value}s over {kicker}s",
+    HandRank.FLUSH: "{value}-high Flush",
+    HandRank.STRAIGHT: "{value}-high Straight",
+    HandRank.THREE_OF_A_KIND: "Three {value}s",
+    HandRank.TWO_PAIR: "Two Pair, {value}s and {kicker}s",
+    HandRank.PAIR: "Pair of {value}s",
+    HandRank.HIGH_CARD: "{value} High"
+})
+
+
 class PokerEngine:
     """Advanced poker engine with pot odds calculation and hand evaluation"""
     
     def __init__(self):
         self.ranks = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
         self.suits = ['h', 'd', 'c', 's']  # hearts, diamonds, clubs, spades
+        self._full_deck_ids = np.arange(52, dtype=np.int8)
         
     def parse_cards(self, card_strings: List[str]) -> List[Card]:
         """Convert card strings to Card objects"""
-        cards = []
+        return list(_parse_cards_tuple(tuple(card_strings)))
+    
+    def parse_card_ids(self, card_strings: List[str]) -> np.ndarray:
+        """Convert card strings to int8 card ids (rank * 4 + suit), skipping invalid ones"""
+        ids = []
         for card_str in card_strings:
             if len(card_str) >= 2:
-                rank = card_str[:-1]
-                suit = card_str[-1].lower()
-                if rank in self.ranks and suit in self.suits:
-                    cards.append(Card(rank, suit))
-        return cards
+                card_id = CARD_IDS.get(card_str[:-1] + card_str[-1].lower())
+                if card_id is not None:
+                    ids.append(card_id)
+        return np.array(ids, dtype=np.int8)
     
     def calculate_pot_odds(
         self,
@@ -64,6 +629,44 @@ class PokerEngine:
         num_players: int = 2
     ) -> Dict[str, Any]:
         """Calculate pot odds and implied odds for the current situation"""
+        equity = self._hand_equity(player_cards, community_cards, num_players)
+        return self._pot_odds_for_position(pot_size, bet_to_call, equity, position, num_players)
+    
+    def calculate_pot_odds_batch(
+        self,
+        pot_size: float,
+        bet_to_call: float,
+        player_cards: List[str] = None,
+        community_cards: List[str] = None,
+        positions: Sequence[str] = ("unknown",),
+        num_players: int = 2
+    ) -> List[Dict[str, Any]]:
+        """Calculate pot odds for one situation from several positions, evaluating the hand only once"""
+        equity = self._hand_equity(player_cards, community_cards, num_players)
+        return [
+            self._pot_odds_for_position(pot_size, bet_to_call, equity, position, num_players)
+            for position in positions
+        ]
+    
+    def _hand_equity(self, player_cards: List[str], community_cards: List[str], num_players: int) -> float:
+        """Estimated equity of the current hand, or 0 when the cards aren't known"""
+        if not (player_cards and community_cards):
+            return 0.0
+        
+        # Parse and rank the hand once; the equity estimate only needs its category
+        card_ids = self.parse_card_ids(player_cards + community_cards)
+        hand_rank = _cactus_category(self._evaluate_hand_strength_fast(card_ids))
+        return self._calculate_equity(hand_rank, num_players)
+    
+    def _pot_odds_for_position(
+        self,
+        pot_size: float,
+        bet_to_call: float,
+        equity: float,
+        position: str,
+        num_players: int
+    ) -> Dict[str, Any]:
+        """Pot odds, EV and recommendation for a known equity from one position"""
         
         # Basic pot odds calculation
         pot_odds_ratio = bet_to_call / (pot_size + bet_to_call)
@@ -74,11 +677,6 @@ class PokerEngine:
             pot_size, bet_to_call, position, num_players
         )
         
-        # Calculate equity if cards are provided
-        equity = 0.0
-        if player_cards and community_cards:
-            equity = self._calculate_equity(player_cards, community_cards, num_players)
-        
         # Determine if call is profitable
         is_profitable = equity > pot_odds_percentage if equity > 0 else False
         
@@ -89,7 +687,7 @@ class PokerEngine:
         
         # Generate recommendation
         recommendation = self._generate_recommendation(
-            pot_odds_percentage, equity, ev, position, num_players
+            pot_odds_percentage, equity, ev, bet_to_call, position, num_players
         )
         
         return {
@@ -147,64 +745,104 @@ class PokerEngine:
         player_cards: List[str],
         community_cards: List[str] = None,
         num_players: int = 2,
-        num_simulations: int = 10000
+        num_simulations: int = 1000,
+        tolerance: Optional[float] = None
     ) -> Dict[str, Any]:
-        """Calculate winning probabilities through Monte Carlo simulation"""
+        """Calculate winning probabilities through Monte Carlo simulation
+        
+        1000 deals already put the win probability within about ±2%, which is
+        finer than anything the UI shows. With a tolerance, deals run in
+        batches and stop once the 95% Wilson interval half-width on the win
+        probability drops below it; "simulations" reports how many ran.
+        """
         
         if not player_cards or len(player_cards) < 2:
             raise ValueError("Player must have at least 2 cards")
         
-        # Parse known cards
-        known_cards = self.parse_cards(player_cards + (community_cards or []))
+        # Parse known cards straight to ids; the simulation never needs Card objects
+        hole_ids = self.parse_card_ids(player_cards)[:2]
+        board_ids = self.parse_card_ids(community_cards or [])
+        if hole_ids.size < 2:
+            raise ValueError("Player must have at least 2 valid cards")
+        # The simulation backends size their decks and hand buffers from these, unchecked
+        if board_ids.size > 5:
+            raise ValueError("Board cannot have more than 5 cards")
+        known = np.concatenate([hole_ids, board_ids])
+        if np.unique(known).size != known.size:
+            raise ValueError("Duplicate cards in hand and board")
         
         # Run Monte Carlo simulation
-        wins = 0
-        ties = 0
-        
-        for _ in range(num_simulations):
-            # Create deck without known cards
-            deck = self._create_deck(known_cards)
-            
-            # Deal remaining community cards
-            remaining_community = 5 - len(community_cards) if community_cards else 5
-            simulated_board = board_cards + random.sample(deck, remaining_community)
-            
-            # Deal opponent hands
-            opponent_hands = []
-            for _ in range(num_players - 1):
-                if len(deck) >= 2:
-                    opponent_hand = random.sample(deck, 2)
-                    opponent_hands.append(opponent_hand)
-                    deck = [card for card in deck if card not in opponent_hand]
-            
-            # Evaluate all hands
-            player_hand = self._evaluate_hand_strength(hole_cards + simulated_board)
-            player_score = (player_hand[0].value, player_hand[1], player_hand[2])
-            
-            best_opponent_score = (0, 0, [])
-            for opponent_hand in opponent_hands:
-                opponent_eval = self._evaluate_hand_strength(opponent_hand + simulated_board)
-                opponent_score = (opponent_eval[0].value, opponent_eval[1], opponent_eval[2])
-                if opponent_score > best_opponent_score:
-                    best_opponent_score = opponent_score
-            
-            # Determine winner
-            if player_score > best_opponent_score:
-                wins += 1
-            elif player_score == best_opponent_score:
-                ties += 1
-        
-        win_probability = wins / num_simulations * 100
-        tie_probability = ties / num_simulations * 100
+        if tolerance is None:
+            wins, ties = self._run_simulations(hole_ids, board_ids, num_players, num_simulations)
+            simulations = num_simulations
+        else:
+            wins = ties = simulations = 0
+            while simulations < num_simulations:
+                batch = min(EARLY_STOP_BATCH, num_simulations - simulations)
+                batch_wins, batch_ties = self._run_simulations(hole_ids, board_ids, num_players, batch)
+                wins += batch_wins
+                ties += batch_ties
+                simulations += batch
+                if _wilson_half_width(wins, simulations) < tolerance:
+                    break
+        
+        win_probability = wins / simulations * 100
+        tie_probability = ties / simulations * 100
         lose_probability = 100 - win_probability - tie_probability
         
         return {
             "win_probability": round(win_probability, 2),
             "tie_probability": round(tie_probability, 2),
             "lose_probability": round(lose_probability, 2),
-            "simulations": num_simulations
+            "simulations": simulations
         }
     
+    def _run_simulations(
+        self,
+        hole_ids: np.ndarray,
+        board_ids: np.ndarray,
+        num_players: int,
+        num_simulations: int
+    ) -> Tuple[int, int]:
+        """Count (wins, ties) over num_simulations deals with the fastest available backend"""
+        if NUMBA_AVAILABLE:
+            # 45 cards remain once the board is complete, enough for 22 opponents
+            n_opp = min(num_players - 1, 22)
+            # The kernel already uses every core; running it from two threads at once aborts
+            # the process under numba's default workqueue threading layer
+            with _kernel_lock:
+                return _mc_kernel(
+                    hole_ids, board_ids, n_opp, num_simulations,
+                    _CARD_ID_INTS, _FLUSH_TABLE, _RANK_STATES, _STATE_VALUES
+                )
+        return self._simulate(hole_ids, board_ids, num_players, num_simulations)
+    
+    def _simulate(
+        self,
+        hole_ids: np.ndarray,
+        board_ids: np.ndarray,
+        num_players: int,
+        num_simulations: int
+    ) -> Tuple[int, int]:
+        """Vectorized Monte Carlo run, used when numba is not installed"""
+        
+        remaining = self._create_deck(np.concatenate([hole_ids, board_ids]))
+        n_opp = min(num_players - 1, 22)
+        
+        # Small runs, and runs already inside a worker process, aren't worth the IPC
+        if num_simulations < PARALLEL_MIN_SIMULATIONS or _in_pool_worker:
+            return _simulate_deals(hole_ids, board_ids, remaining, n_opp, num_simulations)
+        
+        workers = os.cpu_count() or 1
+        chunks = [num_simulations // workers + (i < num_simulations % workers) for i in range(workers)]
+        pool = _simulation_pool()
+        futures = [
+            pool.submit(_simulate_deals, hole_ids, board_ids, remaining, n_opp, chunk)
+            for chunk in chunks if chunk
+        ]
+        wins, ties = map(sum, zip(*(future.result() for future in futures)))
+        return wins, ties
+    
     def _calculate_implied_odds(
         self,
         pot_size: float,
@@ -218,15 +856,7 @@ class PokerEngine:
         base_multiplier = 1.0
         
         # Position adjustments
-        position_multipliers = {
-            "button": 1.2,
-            "cutoff": 1.1,
-            "middle": 1.0,
-            "early": 0.9,
-            "blinds": 1.0
-        }
-        
-        position_mult = position_multipliers.get(position.lower(), 1.0)
+        position_mult = _POSITION_MULT.get(position.lower(), 1.0)
         
         # Number of players adjustment
         player_multiplier = max(0.8, 1.0 - (num_players - 2) * 0.1)
@@ -236,38 +866,14 @@ class PokerEngine:
         
         return implied_odds
     
-    def _calculate_equity(
-        self,
-        player_cards: List[str],
-        community_cards: List[str],
-        num_players: int
-    ) -> float:
+    def _calculate_equity(self, hand_rank: HandRank, num_players: int) -> float:
         """Calculate hand equity (winning probability)"""
         
         # This is a simplified equity calculation
         # In a real implementation, you'd use more sophisticated methods
         
-        hole_cards = self.parse_cards(player_cards)
-        board_cards = self.parse_cards(community_cards)
-        
-        # Basic equity based on hand strength
-        hand_rank, hand_value, _ = self._evaluate_hand_strength(hole_cards + board_cards)
-        
         # Convert hand rank to equity percentage
-        rank_equity = {
-            HandRank.ROYAL_FLUSH: 95.0,
-            HandRank.STRAIGHT_FLUSH: 90.0,
-            HandRank.FOUR_OF_A_KIND: 85.0,
-            HandRank.FULL_HOUSE: 80.0,
-            HandRank.FLUSH: 75.0,
-            HandRank.STRAIGHT: 70.0,
-            HandRank.THREE_OF_A_KIND: 65.0,
-            HandRank.TWO_PAIR: 60.0,
-            HandRank.PAIR: 55.0,
-            HandRank.HIGH_CARD: 50.0
-        }
-        
-        base_equity = rank_equity.get(hand_rank, 50.0)
+        base_equity = _RANK_EQUITY.get(hand_rank, 50.0)
         
         # Adjust for number of players
         player_adjustment = max(0.5, 1.0 - (num_players - 2) * 0.1)
@@ -293,6 +899,7 @@ class PokerEngine:
         pot_odds: float,
         equity: float,
         ev: float,
+        bet_to_call: float,
         position: str,
         num_players: int
     ) -> str:
@@ -317,150 +924,134 @@ class PokerEngine:
         if len(cards) < 5:
             return HandRank.HIGH_CARD, 0, []
         
-        # Sort cards by value
-        sorted_cards = sorted(cards, key=lambda x: x.get_value(), reverse=True)
+        # Sort the rank values directly; no key function needed on plain ints
+        values = sorted((card.value for card in cards), reverse=True)
         
-        # Check for flush
-        suits = [card.suit for card in cards]
-        flush_suit = None
-        for suit in set(suits):
-            if suits.count(suit) >= 5:
-                flush_suit = suit
-                break
+        # Count ranks once; the helpers below scan these counts
+        value_counts = Counter(values)
         
-        # Check for straight
-        values = [card.get_value() for card in sorted_cards]
-        straight_high = self._find_straight_high(values)
+        # One rank bitmap per suit (bit v-1 marks rank v), built in a single pass
+        suit_masks = dict.fromkeys(_SUITS, 0)
+        for card in cards:
+            suit_masks[card.suit] |= 1 << (card.value - 1)
+        flush_mask = next((mask for mask in suit_masks.values() if bin(mask).count("1") >= 5), 0)
         
-        # Check for straight flush
-        if flush_suit and straight_high:
-            if straight_high == 14:  # Ace high
+        # Check for straight flush within the flush suit's ranks
+        if flush_mask:
+            straight_flush_high = self._straight_high_from_bits(flush_mask)
+            if straight_flush_high == 14:  # Ace high
                 return HandRank.ROYAL_FLUSH, 14, []
-            else:
-                return HandRank.STRAIGHT_FLUSH, straight_high, []
+            elif straight_flush_high:
+                return HandRank.STRAIGHT_FLUSH, straight_flush_high, []
+        
+        # Check for straight
+        straight_high = self._find_straight_high(values)
         
         # Check for four of a kind
-        four_kind = self._find_four_of_a_kind(values)
+        four_kind = self._find_four_of_a_kind(value_counts)
         if four_kind:
             return HandRank.FOUR_OF_A_KIND, four_kind, []
         
         # Check for full house
-        full_house = self._find_full_house(values)
+        full_house = self._find_full_house(value_counts)
         if full_house:
             return HandRank.FULL_HOUSE, full_house[0], [full_house[1]]
         
         # Check for flush
-        if flush_suit:
-            flush_cards = [card for card in sorted_cards if card.suit == flush_suit][:5]
-            return HandRank.FLUSH, flush_cards[0].get_value(), [card.get_value() for card in flush_cards[1:]]
+        if flush_mask:
+            flush_values = [value for value in range(14, 1, -1) if flush_mask >> (value - 1) & 1][:5]
+            return HandRank.FLUSH, flush_values[0], flush_values[1:]
         
         # Check for straight
         if straight_high:
             return HandRank.STRAIGHT, straight_high, []
         
         # Check for three of a kind
-        three_kind = self._find_three_of_a_kind(values)
+        three_kind = self._find_three_of_a_kind(value_counts)
         if three_kind:
             return HandRank.THREE_OF_A_KIND, three_kind, []
         
         # Check for two pair
-        two_pair = self._find_two_pair(values)
+        two_pair = self._find_two_pair(value_counts)
         if two_pair:
             return HandRank.TWO_PAIR, two_pair[0], [two_pair[1]]
         
         # Check for pair
-        pair = self._find_pair(values)
+        pair = self._find_pair(value_counts)
         if pair:
             return HandRank.PAIR, pair, []
         
         # High card
-        return HandRank.HIGH_CARD, sorted_cards[0].get_value(), [card.get_value() for card in sorted_cards[1:5]]
+        return HandRank.HIGH_CARD, values[0], values[1:5]
+    
+    def _evaluate_hand_strength_fast(self, card_ids: np.ndarray) -> int:
+        """Evaluate a hand of card ids as a single Cactus Kev int (lower is stronger)"""
+        hand = tuple(sorted(set(card_ids.tolist())))
+        if len(hand) > 7:
+            raise ValueError("A hand has at most 7 cards")
+        if len(hand) < 5:
+            # Same fallback as _evaluate_hand_strength: too few cards ranks as high card
+            return _CATEGORY_LIMITS[-1]
+        return _cactus_rank_cached(hand)
     
     def _find_straight_high(self, values: List[int]) -> Optional[int]:
         """Find the highest straight possible"""
-        unique_values = sorted(set(values), reverse=True)
-        
-        # Check for Ace-low straight (A,2,3,4,5)
-        if 14 in unique_values and 2 in unique_values and 3 in unique_values and 4 in unique_values and 5 in unique_values:
-            return 5  # 5-high straight
-        
-        # Check for regular straights
-        for i in range(len(unique_values) - 4):
-            if unique_values[i] - unique_values[i + 4] == 4:
-                return unique_values[i]
-        
-        return None
+        bits = 0
+        for value in values:
+            bits |= 1 << (value - 1)
+        return self._straight_high_from_bits(bits)
     
-    def _find_four_of_a_kind(self, values: List[int]) -> Optional[int]:
+    def _straight_high_from_bits(self, bits: int) -> Optional[int]:
+        """Find the highest straight in a rank bitmap where bit v-1 marks rank v"""
+        # Copy the ace down to bit 0 so A-2-3-4-5 lines up
+        bits |= (bits >> 13) & 1
+        
+        # Bit i survives only when bits i..i+4 are all set
+        runs = bits & (bits >> 1) & (bits >> 2) & (bits >> 3) & (bits >> 4)
+        if not runs:
+            return None
+        return runs.bit_length() + 4
+    
+    def _find_four_of_a_kind(self, value_counts: Counter) -> Optional[int]:
         """Find four of a kind"""
-        for value in set(values):
-            if values.count(value) == 4:
-                return value
-        return None
+        return max((value for value, count in value_counts.items() if count == 4), default=None)
     
-    def _find_full_house(self, values: List[int]) -> Optional[Tuple[int, int]]:
+    def _find_full_house(self, value_counts: Counter) -> Optional[Tuple[int, int]]:
         """Find full house (three of a kind + pair)"""
-        value_counts = {}
-        for value in values:
-            value_counts[value] = value_counts.get(value, 0) + 1
-        
         three_kind = None
         pair = None
         
         for value, count in value_counts.items():
-            if count >= 3:
-                if three_kind is None or value > three_kind:
-                    three_kind = value
-            elif count >= 2:
-                if pair is None or value > pair:
-                    pair = value
+            if count >= 3 and (three_kind is None or value > three_kind):
+                # A displaced set of trips still fills the pair
+                if three_kind is not None and (pair is None or three_kind > pair):
+                    pair = three_kind
+                three_kind = value
+            elif count >= 2 and (pair is None or value > pair):
+                pair = value
         
         if three_kind and pair:
             return (three_kind, pair)
         return None
     
-    def _find_three_of_a_kind(self, values: List[int]) -> Optional[int]:
+    def _find_three_of_a_kind(self, value_counts: Counter) -> Optional[int]:
         """Find three of a kind"""
-        for value in set(values):
-            if values.count(value) == 3:
-                return value
-        return None
+        return max((value for value, count in value_counts.items() if count == 3), default=None)
     
-    def _find_two_pair(self, values: List[int]) -> Optional[Tuple[int, int]]:
+    def _find_two_pair(self, value_counts: Counter) -> Optional[Tuple[int, int]]:
         """Find two pair"""
-        pairs = []
-        for value in set(values):
-            if values.count(value) == 2:
-                pairs.append(value)
-        
+        pairs = sorted((value for value, count in value_counts.items() if count == 2), reverse=True)
         if len(pairs) >= 2:
-            pairs.sort(reverse=True)
             return (pairs[0], pairs[1])
         return None
     
-    def _find_pair(self, values: List[int]) -> Optional[int]:
+    def _find_pair(self, value_counts: Counter) -> Optional[int]:
         """Find a pair"""
-        for value in set(values):
-            if values.count(value) == 2:
-                return value
-        return None
+        return max((value for value, count in value_counts.items() if count == 2), default=None)
     
     def _calculate_hand_strength_percentage(self, hand_rank: HandRank, hand_value: int) -> float:
         """Calculate hand strength as a percentage"""
-        base_percentages = {
-            HandRank.ROYAL_FLUSH: 100.0,
-            HandRank.STRAIGHT_FLUSH: 95.0,
-            HandRank.FOUR_OF_A_KIND: 90.0,
-            HandRank.FULL_HOUSE: 85.0,
-            HandRank.FLUSH: 80.0,
-            HandRank.STRAIGHT: 75.0,
-            HandRank.THREE_OF_A_KIND: 70.0,
-            HandRank.TWO_PAIR: 65.0,
-            HandRank.PAIR: 60.0,
-            HandRank.HIGH_CARD: 50.0
-        }
-        
-        base = base_percentages.get(hand_rank, 50.0)
+        base = _HAND_BASE_PCT[hand_rank.value]
         
         # Adjust based on hand value
         value_adjustment = (hand_value - 2) * 0.5  # 2 is lowest card value
@@ -469,27 +1060,15 @@ class PokerEngine:
     
     def _get_hand_description(self, hand_rank: HandRank, hand_value: int, kickers: List[int]) -> str:
         """Get human-readable hand description"""
-        rank_names = {
-            2: "2", 3: "3", 4: "4", 5: "5", 6: "6", 7: "7", 8: "8", 9: "9",
-            10: "10", 11: "Jack", 12: "Queen", 13: "King", 14: "Ace"
-        }
-        
-        value_name = rank_names.get(hand_value, str(hand_value))
-        
-        descriptions = {
-            HandRank.ROYAL_FLUSH: "Royal Flush",
-            HandRank.STRAIGHT_FLUSH: f"{value_name}-high Straight Flush",
-            HandRank.FOUR_OF_A_KIND: f"Four {value_name}s",
-            HandRank.FULL_HOUSE: f"Full House, {value_name}s over {rank_names.get(kickers[0], str(kickers[0]))}s",
-            HandRank.FLUSH: f"{value_name}-high Flush",
-            HandRank.STRAIGHT: f"{value_name}-high Straight",
-            HandRank.THREE_OF_A_KIND: f"Three {value_name}s",
-            HandRank.TWO_PAIR: f"Two Pair, {value_name}s and {rank_names.get(kickers[0], str(kickers[0]))}s",
-            HandRank.PAIR: f"Pair of {value_name}s",
-            HandRank.HIGH_CARD: f"{value_name} High"
-        }
-        
-        return descriptions.get(hand_rank, "Unknown Hand")
+        template = _HAND_DESCRIPTIONS.get(hand_rank)
+        if template is None:
+            return "Unknown Hand"
+        
+        # Only the chosen template is formatted, so hands without kickers never index them
+        return template.format(
+            value=_RANK_NAMES[hand_value],
+            kicker=_RANK_NAMES[kickers[0]] if kickers else ""
+        )
     
     def _calculate_outs(self, hole_cards: List[Card], board_cards: List[Card]) -> Dict[str, int]:
         """Calculate outs (cards that improve the hand)"""
@@ -506,12 +1085,8 @@ class PokerEngine:
         
         return outs
     
-    def _create_deck(self, excluded_cards: List[Card] = None) -> List[Card]:
-        """Create a deck of cards excluding specified cards"""
-        deck = []
-        for rank in self.ranks:
-            for suit in self.suits:
-                card = Card(rank, suit)
-                if not excluded_cards or card not in excluded_cards:
-                    deck.append(card)
-        return deck 
\ No newline at end of file
+    def _create_deck(self, excluded_ids: Optional[np.ndarray] = None) -> np.ndarray:
+        """Create a deck of card ids excluding specified ids"""
+        if excluded_ids is None:
+            return self._full_deck_ids.copy()
+        return np.setdiff1d(self._full_deck_ids, excluded_ids) 
\ No newline at end of file
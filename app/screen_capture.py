@@ -4,19 +4,171 @@ import pyautogui
 from PIL import Image, ImageDraw, ImageFont
 import pytesseract
 from typing import List, Dict, Any, Optional, Tuple
+import os
+import queue
+import re
+import tempfile
 import time
 import threading
 import asyncio
 from dataclasses import dataclass
-from collections import defaultdict
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import zip_longest
 
-@dataclass
+try:
+    import dxcam
+    DXCAM_AVAILABLE = True
+except (ImportError, OSError, AttributeError):  # dxcam is Windows-only and optional; fall back to mss
+    DXCAM_AVAILABLE = False
+
+try:
+    import mss
+    MSS_AVAILABLE = True
+except ImportError:  # mss is optional; fall back to pyautogui screenshots
+    MSS_AVAILABLE = False
+
+try:
+    import tesserocr
+    TESSEROCR_AVAILABLE = True
+except ImportError:  # tesserocr is optional; fall back to pytesseract subprocesses
+    TESSEROCR_AVAILABLE = False
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba is optional; fall back to the NumPy contour filter
+    NUMBA_AVAILABLE = False
+
+# Tesseract can hang on very long image lists, so card crops are OCR'd in chunks
+OCR_BATCH_SIZE = 32
+
+# Recognized cards are cached by a DHASH_SIZE x DHASH_SIZE difference hash of the crop
+OCR_CACHE_SIZE = 512
+DHASH_SIZE = 16
+
+# Common card patterns, compiled once: (regex, group 1 role, group 2 role)
+_CARD_PATTERNS = (
+    (re.compile(r'(\d{1,2}|[JQKA])([HDCS])'), 'rank', 'suit'),  # 10H, AS, etc.
+    (re.compile(r'([HDCS])(\d{1,2}|[JQKA])'), 'suit', 'rank'),  # H10, SA, etc.
+)
+_VALID_RANKS = frozenset(('2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A'))
+_VALID_SUITS = frozenset(('H', 'D', 'C', 'S'))
+
+# Pot amount patterns, tried in order
+_CURRENCY_PATTERNS = (
+    re.compile(r'\$(\d+(?:,\d{3})*(?:\.\d{2})?)'),  # $1,234.56
+    re.compile(r'(\d+(?:,\d{3})*(?:\.\d{2})?)'),   # 1,234.56
+    re.compile(r'(\d+\.\d{2})'),                    # 123.45
+)
+
+# Rank order for sorting cards, and the suit columns in display order
+_RANK_ORDER = {
+    'A': 14, 'K': 13, 'Q': 12, 'J': 11,
+    '10': 10, '9': 9, '8': 8, '7': 7,
+    '6': 6, '5': 5, '4': 4, '3': 3, '2': 2
+}
+_SUIT_CODES = ('h', 'd', 'c', 's')
+
+# Display layouts for organized cards: (title, header, row template, total template)
+_PLAIN_ROW = "{:<20}|{:<20}|{:<20}|{:<20}"
+_PLAIN_DISPLAY = (
+    "Cards Organized by Suits:",
+    _PLAIN_ROW.format('♥ Hearts', '♦ Diamonds', '♣ Clubs', '♠ Spades'),
+    _PLAIN_ROW,
+    "Total cards: {}",
+)
+
+# ANSI color codes: hearts red, diamonds blue, clubs green, spades black
+_RED, _BLUE, _GREEN, _BLACK = '\033[91m', '\033[94m', '\033[92m', '\033[30m'
+_BOLD, _RESET = '\033[1m', '\033[0m'
+_COLORED_ROW = "|".join(f"{color}{{:<20}}{_RESET}" for color in (_RED, _BLUE, _GREEN, _BLACK))
+_COLORED_DISPLAY = (
+    f"{_BOLD}Cards Organized by Suits:{_RESET}",
+    _COLORED_ROW.format('♥ Hearts', '♦ Diamonds', '♣ Clubs', '♠ Spades'),
+    _COLORED_ROW,
+    f"{_BOLD}Total cards: {{}}{_RESET}",
+)
+
+# Pot OCR only needs digits and currency punctuation; a pot region is read as one line
+POT_OCR_CHARS = "0123456789$,."
+POT_OCR_PSM_FULL, POT_OCR_PSM_REGION = 6, 7  # uniform block of text, single line
+
+# Each card crop is read as a single line of text
+CARD_OCR_PSM = 7
+
+# Pot OCR is skipped unless this many pixels differ from their local mean by more than POT_TEXT_CONTRAST
+POT_TEXT_CONTRAST = 40
+POT_MIN_TEXT_PIXELS = 20
+
+# Frames whose FRAME_DIFF_SIZE x FRAME_DIFF_SIZE gray thumbnail differs from the last analyzed
+# frame by less than FRAME_DIFF_THRESHOLD gray levels in every pixel reuse its analysis. The max
+# rather than the mean, because one new card only moves a few thumbnail pixels
+FRAME_DIFF_SIZE = 64
+FRAME_DIFF_THRESHOLD = 8
+
+# Width in pixels that screenshots are downscaled to before edge detection
+EDGE_DETECT_WIDTH = 960
+
+# Card-sized contours: area range in pixels and width/height aspect ratio range
+CARD_MIN_AREA, CARD_MAX_AREA = 1000, 50000
+CARD_MIN_ASPECT, CARD_MAX_ASPECT = 1.5, 3.5
+
+# Gray level above which pixels count as card face for the pre-detection blob gate
+CARD_GATE_THRESHOLD = 200
+
+# Outline simplification tolerance as a fraction of the contour perimeter
+CARD_OUTLINE_EPSILON = 0.02
+
+if NUMBA_AVAILABLE:
+    @njit(nogil=True, cache=True)
+    def _card_contour_mask(areas, bboxes):
+        """Mark contours whose area and bounding box aspect ratio look like a card"""
+        mask = np.empty(areas.shape[0], np.bool_)
+        for i in range(areas.shape[0]):
+            h = bboxes[i, 3]
+            aspect_ratio = bboxes[i, 2] / h if h else 0.0
+            mask[i] = (CARD_MIN_AREA <= areas[i] <= CARD_MAX_AREA
+                       and CARD_MIN_ASPECT <= aspect_ratio <= CARD_MAX_ASPECT)
+        return mask
+else:
+    def _card_contour_mask(areas, bboxes):
+        """Mark contours whose area and bounding box aspect ratio look like a card"""
+        # Compare w against multiples of h rather than dividing, so no zero-height special case
+        widths, heights = bboxes[:, 2], bboxes[:, 3]
+        return ((areas >= CARD_MIN_AREA) & (areas <= CARD_MAX_AREA) & (heights > 0)
+                & (widths >= CARD_MIN_ASPECT * heights) & (widths <= CARD_MAX_ASPECT * heights))
+
+@dataclass(frozen=True)
 class DetectedCard:
     """Represents a detected playing card"""
+    __slots__ = ('rank', 'suit', 'confidence', 'position')
     rank: str
     suit: str
     confidence: float
     position: Tuple[int, int, int, int]  # x, y, width, height
+    
+    def __post_init__(self):
+        # Suits are compared lowercase everywhere, so normalize once here
+        object.__setattr__(self, 'suit', self.suit.lower())
+
+@dataclass
+class CardBatch:
+    """Detected cards as parallel arrays, for sorting and filtering without per-card attribute lookups"""
+    ranks: np.ndarray        # int8 rank values (A=14), 0 for unrecognized ranks
+    suits: np.ndarray        # unicode lowercase suit codes
+    confidences: np.ndarray  # float32
+    bboxes: np.ndarray       # int32 (N, 4) x, y, width, height
+    
+    @classmethod
+    def from_cards(cls, cards: List[DetectedCard]) -> "CardBatch":
+        """Build a batch from detected cards, keeping their order"""
+        return cls(
+            ranks=np.fromiter((_RANK_ORDER.get(card.rank, 0) for card in cards), np.int8, len(cards)),
+            suits=np.array([card.suit for card in cards], dtype=str),
+            confidences=np.fromiter((card.confidence for card in cards), np.float32, len(cards)),
+            bboxes=np.array([card.position for card in cards], dtype=np.int32).reshape(-1, 4)
+        )
 
 @dataclass
 class DetectedPot:
@@ -40,15 +192,53 @@ class ScreenCapture:
     def __init__(self):
         self.is_capturing = False
         self.capture_thread = None
+        self.analysis_thread = None
+        # Replaced on every start; each run's threads hold their own queue and stop event
+        self._stop_event = threading.Event()
         self.capture_region = None
         self.update_frequency = 1000  # milliseconds
         self.card_templates = {}
         self.pot_detection_enabled = True
         self.card_detection_enabled = True
+        self.pot_region = None  # x, y, width, height within the capture; whole frame if unset
+        
+        # Thumbnail of the last fully analyzed frame and its analysis, for skipping unchanged frames
+        self._prev_thumbnail = None
+        self._prev_analysis = None
+        
+        # dxcam or mss screen grabber (opened by the capture thread) and frame buffers free for reuse
+        self._dx = None
+        self._sct = None
+        self._free_buffers = queue.Queue()
+        
+        # Gray, downscaled and edge images reused from frame to frame by the analysis thread
+        self._scratch_buffers = {}
+        
+        # Edge detection runs on the GPU when OpenCV has CUDA support and a device
+        try:
+            self._cuda = cv2.cuda.getCudaEnabledDeviceCount() > 0
+        except (AttributeError, cv2.error):
+            self._cuda = False
+        if self._cuda:
+            self._gpu_gray = cv2.cuda_GpuMat()
+            self._gpu_canny = cv2.cuda.createCannyEdgeDetector(50, 150)
+        
+        # Recognized cards keyed by crop hash, oldest first
+        self._ocr_cache = OrderedDict()
+        
+        # Tesseract runs about 4 threads per instance, so size the pool to match the cores
+        self._ocr_workers = max(1, (os.cpu_count() or 1) // 4)
+        self._ocr_pool = ThreadPoolExecutor(max_workers=self._ocr_workers, thread_name_prefix="ocr")
+        
+        # tesserocr handles per thread, keyed by (psm, whitelist); an API must not be shared across threads
+        self._tess_local = threading.local()
         
         # Initialize OCR
         try:
-            pytesseract.get_tesseract_version()
+            if TESSEROCR_AVAILABLE:
+                tesserocr.tesseract_version()
+            else:
+                pytesseract.get_tesseract_version()
         except Exception:
             print("⚠️  Tesseract not found. OCR features will be disabled.")
             self.ocr_enabled = False
@@ -56,65 +246,180 @@ class ScreenCapture:
             self.ocr_enabled = True
     
     def start_capture(self, region: Optional[Tuple[int, int, int, int]] = None, frequency: int = 1000):
-        """Start screen capture in a separate thread"""
+        """Start screen capture and analysis in separate threads"""
         if self.is_capturing:
             return {"status": "error", "message": "Capture already running"}
+        # A slow analysis can outlive stop_capture's join timeout; the grabber handles and
+        # scratch buffers are per instance, so a new run must wait for both old threads
+        if any(thread is not None and thread.is_alive() for thread in (self.capture_thread, self.analysis_thread)):
+            return {"status": "error", "message": "Previous capture is still stopping"}
         
         self.capture_region = region
         self.update_frequency = frequency
         self.is_capturing = True
         
-        self.capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
+        stop_event = threading.Event()
+        frames = queue.Queue(maxsize=1)
+        self._stop_event = stop_event
+        self.capture_thread = threading.Thread(target=self._capture_producer, args=(frames, stop_event), daemon=True)
+        self.analysis_thread = threading.Thread(target=self._capture_consumer, args=(frames,), daemon=True)
         self.capture_thread.start()
+        self.analysis_thread.start()
         
         return {"status": "success", "message": "Screen capture started"}
     
     def stop_capture(self):
         """Stop screen capture"""
         self.is_capturing = False
+        self._stop_event.set()  # interrupts the capture thread's wait for its next frame
         if self.capture_thread:
             self.capture_thread.join(timeout=1)
+        if self.analysis_thread:
+            self.analysis_thread.join(timeout=1)
         
         return {"status": "success", "message": "Screen capture stopped"}
     
-    def _capture_loop(self):
-        """Main capture loop"""
-        while self.is_capturing:
+    def _capture_producer(self, frames: queue.Queue, stop_event: threading.Event):
+        """Grab frames at the update frequency and hand the newest one to the analysis thread"""
+        # Grabber handles are tied to the thread that opened them, so open them here
+        if DXCAM_AVAILABLE:
+            try:
+                self._dx = dxcam.create()
+            except Exception as e:
+                print(f"dxcam unavailable, falling back: {e}")
+        if self._dx is None and MSS_AVAILABLE:
+            self._sct = mss.mss()
+        
+        try:
+            next_frame = time.monotonic()
+            while not stop_event.is_set():
+                try:
+                    # Capture screen
+                    screenshot = self._capture_screen()
+                    if screenshot is not None:
+                        self._publish_frame(frames, screenshot)
+                    
+                    # Wait for the next deadline so grab time doesn't stretch the period;
+                    # after an overrun, start the next frame now instead of catching up
+                    next_frame += self.update_frequency / 1000.0
+                    now = time.monotonic()
+                    if next_frame < now:
+                        next_frame = now
+                    stop_event.wait(next_frame - now)
+                    
+                except Exception as e:
+                    print(f"Error in capture loop: {e}")
+                    stop_event.wait(1)
+                    next_frame = time.monotonic()
+        finally:
+            if self._dx is not None:
+                self._dx.release()
+                self._dx = None
+            if self._sct is not None:
+                self._sct.close()
+                self._sct = None
+            # Wake the analysis thread so it can exit
+            self._publish_frame(frames, None)
+    
+    def _publish_frame(self, frames: queue.Queue, frame: Optional[np.ndarray]):
+        """Queue a frame for analysis, replacing one the analysis thread hasn't picked up yet"""
+        try:
+            stale = frames.get_nowait()
+        except queue.Empty:
+            pass
+        else:
+            self._recycle_frame(stale)
+        # Only this thread puts frames, so there is room after the get above
+        frames.put_nowait(frame)
+    
+    def _capture_consumer(self, frames: queue.Queue):
+        """Analyze frames as the capture thread produces them"""
+        while True:
+            screenshot = frames.get()
+            if screenshot is None:
+                break
+            
             try:
-                # Capture screen
-                screenshot = self._capture_screen()
-                if screenshot is None:
-                    continue
-                
                 # Analyze the screenshot
                 analysis = self._analyze_screenshot(screenshot)
                 
                 # Store results for retrieval
                 self.last_analysis = analysis
                 
-                # Wait for next capture
-                time.sleep(self.update_frequency / 1000.0)
-                
             except Exception as e:
-                print(f"Error in capture loop: {e}")
-                time.sleep(1)
+                print(f"Error in analysis loop: {e}")
+            finally:
+                self._recycle_frame(screenshot)
+    
+    def _recycle_frame(self, frame: Optional[np.ndarray]):
+        """Return a frame's buffer once nothing reads it, so the next grab can reuse it"""
+        if frame is not None:
+            self._free_buffers.put(frame)
     
     def _capture_screen(self) -> Optional[np.ndarray]:
         """Capture screen or region"""
         try:
+            if self._dx is not None:
+                return self._grab_dxcam()
+            if self._sct is not None:
+                return self._grab_mss()
+            
             if self.capture_region:
                 screenshot = pyautogui.screenshot(region=self.capture_region)
             else:
                 screenshot = pyautogui.screenshot()
             
             # Convert to OpenCV format
-            screenshot_cv = cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
-            return screenshot_cv
+            rgb = np.asarray(screenshot)
+            return cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR, dst=self._frame_buffer(rgb.shape[0], rgb.shape[1]))
             
         except Exception as e:
             print(f"Error capturing screen: {e}")
             return None
     
+    def _grab_dxcam(self) -> Optional[np.ndarray]:
+        """Grab the capture region through Desktop Duplication; None when the screen hasn't changed"""
+        if self.capture_region:
+            x, y, w, h = self.capture_region
+            rgb = self._dx.grab(region=(x, y, x + w, y + h))
+        else:
+            rgb = self._dx.grab()
+        
+        # No new frame means nothing new to analyze, so the last analysis stands
+        if rgb is None:
+            return None
+        return cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR, dst=self._frame_buffer(rgb.shape[0], rgb.shape[1]))
+    
+    def _grab_mss(self) -> np.ndarray:
+        """Grab the capture region with mss straight into the reusable BGR buffer"""
+        if self.capture_region:
+            x, y, w, h = self.capture_region
+            monitor = {"left": x, "top": y, "width": w, "height": h}
+        else:
+            # Primary monitor, matching pyautogui.screenshot()
+            monitor = self._sct.monitors[1]
+        
+        raw = self._sct.grab(monitor)
+        bgra = np.frombuffer(raw.bgra, dtype=np.uint8).reshape(raw.height, raw.width, 4)
+        return cv2.cvtColor(bgra, cv2.COLOR_BGRA2BGR, dst=self._frame_buffer(raw.height, raw.width))
+    
+    def _frame_buffer(self, height: int, width: int) -> np.ndarray:
+        """A BGR frame buffer, reusing one whose frame has finished analysis when one of the right size is free"""
+        try:
+            buffer = self._free_buffers.get_nowait()
+        except queue.Empty:
+            buffer = None
+        if buffer is None or buffer.shape != (height, width, 3):
+            buffer = np.empty((height, width, 3), dtype=np.uint8)
+        return buffer
+    
+    def _scratch(self, name: str, shape: Tuple[int, ...]) -> np.ndarray:
+        """Persistent per-stage array for the analysis thread, reallocated only when the frame size changes"""
+        buffer = self._scratch_buffers.get(name)
+        if buffer is None or buffer.shape != shape:
+            buffer = self._scratch_buffers[name] = np.empty(shape, dtype=np.uint8)
+        return buffer
+    
     def _analyze_screenshot(self, image: np.ndarray) -> Dict[str, Any]:
         """Analyze screenshot for poker elements"""
         analysis = {
@@ -127,9 +432,18 @@ class ScreenCapture:
         }
         
         try:
+            # Both detectors work on grayscale, so convert the frame once
+            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY, dst=self._scratch("gray", image.shape[:2]))
+            
+            # A static table gives near-identical frames; reuse the last full analysis for those
+            thumbnail = cv2.resize(gray, (FRAME_DIFF_SIZE, FRAME_DIFF_SIZE), interpolation=cv2.INTER_AREA)
+            if (self._prev_analysis is not None
+                    and cv2.norm(thumbnail, self._prev_thumbnail, cv2.NORM_INF) < FRAME_DIFF_THRESHOLD):
+                return {**self._prev_analysis, "timestamp": analysis["timestamp"]}
+            
             # Detect cards
             if self.card_detection_enabled:
-                cards = self._detect_cards(image)
+                cards = self._detect_cards(image, gray)
                 analysis["detected_cards"] = cards
                 
                 # Organize cards by suits
@@ -138,57 +452,66 @@ class ScreenCapture:
             
             # Detect pot
             if self.pot_detection_enabled:
-                pot = self._detect_pot(image)
+                pot = self._detect_pot(image, gray)
                 analysis["detected_pot"] = pot
             
             # Calculate overall confidence
             confidence = self._calculate_confidence(analysis)
             analysis["confidence"] = confidence
             
+            self._prev_thumbnail = thumbnail
+            self._prev_analysis = analysis
+            
         except Exception as e:
             analysis["error"] = str(e)
         
         return analysis
     
-    def _detect_cards(self, image: np.ndarray) -> List[DetectedCard]:
+    def _detect_cards(self, image: np.ndarray, gray: np.ndarray) -> List[DetectedCard]:
         """Detect playing cards in the image"""
         cards = []
         
         try:
-            # Convert to grayscale
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            # Card outlines don't need full resolution: detect edges on a copy at most
+            # EDGE_DETECT_WIDTH wide and map the boxes back onto the full-size image
+            scale = min(1.0, EDGE_DETECT_WIDTH / gray.shape[1])
+            small = self._downscale(gray, scale)
+            
+            # Menus and animations often have nothing card-like; skip edge detection for those
+            if not self._has_card_blobs(small, scale):
+                return cards
             
             # Apply edge detection
-            edges = cv2.Canny(gray, 50, 150)
+            edges = self._detect_edges(small)
             
-            # Find contours
-            contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+            # Find contours (Teh-Chin compression keeps far fewer points than CHAIN_APPROX_SIMPLE)
+            contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_TC89_L1)
             
-            for contour in contours:
-                # Filter by area (cards should be reasonably sized)
-                area = cv2.contourArea(contour)
-                if area < 1000 or area > 50000:  # Adjust thresholds as needed
-                    continue
-                
-                # Get bounding rectangle
-                x, y, w, h = cv2.boundingRect(contour)
-                
-                # Check aspect ratio (cards are typically 2.5:1)
-                aspect_ratio = w / h
-                if aspect_ratio < 1.5 or aspect_ratio > 3.5:
-                    continue
-                
-                # Extract card region
-                card_region = image[y:y+h, x:x+w]
-                
-                # Try to recognize the card
-                card_info = self._recognize_card(card_region)
+            # First pass: filter contours down to candidate card crops
+            # (cards are reasonably sized and typically 2.5:1)
+            if not contours:
+                return cards
+            count = len(contours)
+            areas = np.fromiter((cv2.contourArea(contour) for contour in contours), np.float32, count)
+            areas /= scale * scale
+            bboxes = np.fromiter((v for contour in contours for v in cv2.boundingRect(contour)),
+                                 np.float32, count * 4).reshape(count, 4)
+            bboxes = np.rint(bboxes / scale).astype(np.int32)
+            candidates = np.flatnonzero(_card_contour_mask(areas, bboxes))
+            
+            # Cards are quadrilaterals: keep only candidates whose simplified outline has 4-6 corners
+            boxes = [bboxes[i].tolist() for i in candidates if self._is_quadrilateral(contours[i])]
+            crops = [image[y:y+h, x:x+w] for x, y, w, h in boxes]
+            gray_crops = [gray[y:y+h, x:x+w] for x, y, w, h in boxes]
+            
+            # Second pass: recognize every crop together so OCR runs once per batch
+            for card_info, position in zip(self._recognize_cards(crops, gray_crops), map(tuple, boxes)):
                 if card_info:
                     cards.append(DetectedCard(
                         rank=card_info["rank"],
                         suit=card_info["suit"],
                         confidence=card_info["confidence"],
-                        position=(x, y, w, h)
+                        position=position
                     ))
         
         except Exception as e:
@@ -196,53 +519,157 @@ class ScreenCapture:
         
         return cards
     
-    def _recognize_card(self, card_image: np.ndarray) -> Optional[Dict[str, Any]]:
-        """Recognize a single card using OCR and template matching"""
-        try:
-            # Convert to grayscale
-            gray = cv2.cvtColor(card_image, cv2.COLOR_BGR2GRAY)
+    def _is_quadrilateral(self, contour: np.ndarray) -> bool:
+        """Whether a contour's Ramer-Douglas-Peucker simplification has a card-like 4-6 vertices"""
+        epsilon = CARD_OUTLINE_EPSILON * cv2.arcLength(contour, True)
+        return 4 <= len(cv2.approxPolyDP(contour, epsilon, True)) <= 6
+    
+    def _downscale(self, gray: np.ndarray, scale: float) -> np.ndarray:
+        """The gray frame resized by scale (or itself when scale is 1) in a reused buffer"""
+        if scale >= 1.0:
+            return gray
+        size = (round(gray.shape[1] * scale), round(gray.shape[0] * scale))
+        return cv2.resize(gray, size, dst=self._scratch("small", (size[1], size[0])), interpolation=cv2.INTER_AREA)
+    
+    def _has_card_blobs(self, small: np.ndarray, scale: float) -> bool:
+        """Cheap gate before edge detection: is there any bright, card-shaped blob in the frame?"""
+        bright = cv2.threshold(small, CARD_GATE_THRESHOLD, 255, cv2.THRESH_BINARY,
+                               dst=self._scratch("bright", small.shape))[1]
+        _, _, stats, _ = cv2.connectedComponentsWithStats(bright, connectivity=8)
+        
+        # Row 0 is the background; judge blobs by their bounding boxes in full-resolution pixels
+        widths = stats[1:, cv2.CC_STAT_WIDTH] / scale
+        heights = stats[1:, cv2.CC_STAT_HEIGHT] / scale
+        areas = widths * heights
+        return bool(np.any((areas >= CARD_MIN_AREA) & (areas <= CARD_MAX_AREA)
+                           & (widths >= CARD_MIN_ASPECT * heights) & (widths <= CARD_MAX_ASPECT * heights)))
+    
+    def _detect_edges(self, small: np.ndarray) -> np.ndarray:
+        """Canny edges of the downscaled gray frame, computed on the GPU when CUDA is available"""
+        edges = self._scratch("edges", small.shape)
+        
+        if self._cuda:
+            self._gpu_gray.upload(small)
+            return self._gpu_canny.detect(self._gpu_gray).download(edges)
+        
+        return cv2.Canny(small, 50, 150, edges=edges)
+    
+    def _recognize_cards(self, card_images: List[np.ndarray],
+                         grays: List[np.ndarray]) -> List[Optional[Dict[str, Any]]]:
+        """Recognize a frame's cards, given color and grayscale crops, using batched OCR and template matching"""
+        keys = [self._crop_hash(gray) for gray in grays]
+        
+        # Cards rarely change between frames, so only OCR crops not seen recently
+        results = [None] * len(card_images)
+        misses = []
+        for i, key in enumerate(keys):
+            if key in self._ocr_cache:
+                self._ocr_cache.move_to_end(key)
+                results[i] = self._ocr_cache[key]
+            else:
+                misses.append(i)
+        
+        if not misses:
+            return results
+        
+        if self.ocr_enabled:
+            texts = self._ocr_card_texts([grays[i] for i in misses])
+        else:
+            texts = [""] * len(misses)
+        
+        for i, text in zip(misses, texts):
+            # Parse card from text
+            card_info = self._parse_card_text(text.strip().upper()) if text else None
+            if card_info:
+                results[i] = {
+                    "rank": card_info["rank"],
+                    "suit": card_info["suit"],
+                    "confidence": 0.8  # Placeholder confidence
+                }
+            else:
+                # Fallback to template matching
+                results[i] = self._template_match_card(card_images[i])
             
-            # Use OCR to read text
-            if self.ocr_enabled:
-                text = pytesseract.image_to_string(gray, config='--psm 7')
-                text = text.strip().upper()
+            # A failed OCR run is retried next frame rather than cached
+            if text is not None:
+                self._ocr_cache[keys[i]] = results[i]
+                if len(self._ocr_cache) > OCR_CACHE_SIZE:
+                    self._ocr_cache.popitem(last=False)
+        
+        return results
+    
+    def _crop_hash(self, gray: np.ndarray) -> bytes:
+        """Difference hash of a grayscale crop, prefixed with its size, used as the OCR cache key"""
+        small = cv2.resize(gray, (DHASH_SIZE + 1, DHASH_SIZE), interpolation=cv2.INTER_AREA)
+        bits = np.packbits(small[:, 1:] > small[:, :-1])
+        return np.array(gray.shape, dtype=np.int32).tobytes() + bits.tobytes()
+    
+    def _ocr_card_texts(self, card_images: List[np.ndarray]) -> List[Optional[str]]:
+        """OCR card crops in batches spread over the OCR pool, one Tesseract run per batch"""
+        # Each batch is a separate Tesseract process, so the pool's threads run them in parallel
+        batch_size = min(OCR_BATCH_SIZE, -(-len(card_images) // self._ocr_workers))
+        batches = [card_images[start:start + batch_size] for start in range(0, len(card_images), batch_size)]
+        texts = []
+        for batch_texts in self._ocr_pool.map(self._ocr_card_batch, batches):
+            texts.extend(batch_texts)
+        return texts
+    
+    def _ocr_card_batch(self, card_images: List[np.ndarray]) -> List[Optional[str]]:
+        """OCR grayscale card crops in-process with tesserocr, else in one Tesseract run through an image-list file"""
+        if TESSEROCR_AVAILABLE:
+            try:
+                return [self._tesserocr_text(card_image, CARD_OCR_PSM) for card_image in card_images]
+            except Exception as e:
+                print(f"Error recognizing cards: {e}")
+                return [None] * len(card_images)
+        
+        try:
+            with tempfile.TemporaryDirectory() as tmpdir:
+                paths = []
+                for i, card_image in enumerate(card_images):
+                    path = os.path.join(tmpdir, f"card_{i}.png")
+                    cv2.imwrite(path, card_image)
+                    paths.append(path)
                 
-                # Parse card from text
-                card_info = self._parse_card_text(text)
-                if card_info:
-                    return {
-                        "rank": card_info["rank"],
-                        "suit": card_info["suit"],
-                        "confidence": 0.8  # Placeholder confidence
-                    }
-            
-            # Fallback to template matching
-            return self._template_match_card(card_image)
-            
+                list_path = os.path.join(tmpdir, "cards.txt")
+                with open(list_path, "w") as list_file:
+                    list_file.write("\n".join(paths))
+                
+                # Tesseract treats each listed image as a page and ends every page with \f
+                text = pytesseract.image_to_string(list_path, config=f'--psm {CARD_OCR_PSM}')
         except Exception as e:
-            print(f"Error recognizing card: {e}")
-            return None
+            print(f"Error recognizing cards: {e}")
+            return [None] * len(card_images)
+        
+        pages = text.split("\f")
+        return (pages + [""] * len(card_images))[:len(card_images)]
+    
+    def _tesserocr_text(self, gray: np.ndarray, psm: int, whitelist: Optional[str] = None) -> str:
+        """OCR a grayscale image in-process with this thread's tesserocr handle, loading the model only once"""
+        apis = getattr(self._tess_local, "apis", None)
+        if apis is None:
+            apis = self._tess_local.apis = {}
+        
+        api = apis.get((psm, whitelist))
+        if api is None:
+            api = tesserocr.PyTessBaseAPI(psm=psm)
+            if whitelist:
+                api.SetVariable("tessedit_char_whitelist", whitelist)
+            apis[(psm, whitelist)] = api
+        
+        api.SetImage(Image.fromarray(gray))
+        return api.GetUTF8Text()
     
     def _parse_card_text(self, text: str) -> Optional[Dict[str, str]]:
         """Parse card information from OCR text"""
-        # Common card patterns
-        patterns = [
-            (r'(\d{1,2}|[JQKA])([HDCS])', 'rank', 'suit'),  # 10H, AS, etc.
-            (r'([HDCS])(\d{1,2}|[JQKA])', 'suit', 'rank'),  # H10, SA, etc.
-        ]
-        
-        for pattern, rank_group, suit_group in patterns:
-            import re
-            match = re.search(pattern, text)
+        for pattern, rank_group, suit_group in _CARD_PATTERNS:
+            match = pattern.search(text)
             if match:
                 rank = match.group(1) if rank_group == 'rank' else match.group(2)
                 suit = match.group(2) if suit_group == 'suit' else match.group(1)
                 
                 # Validate rank and suit
-                valid_ranks = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
-                valid_suits = ['H', 'D', 'C', 'S']
-                
-                if rank in valid_ranks and suit in valid_suits:
+                if rank in _VALID_RANKS and suit in _VALID_SUITS:
                     return {
                         "rank": rank,
                         "suit": suit.lower()
@@ -256,26 +683,30 @@ class ScreenCapture:
         # For now, return None to indicate no template matching
         return None
     
-    def _detect_pot(self, image: np.ndarray) -> Optional[DetectedPot]:
+    def _detect_pot(self, image: np.ndarray, gray: np.ndarray) -> Optional[DetectedPot]:
         """Detect pot amount in the image"""
         try:
-            # Convert to grayscale
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            # Restrict OCR to the pot's region when one is configured
+            if self.pot_region:
+                x, y, w, h = self.pot_region
+                gray = gray[y:y+h, x:x+w]
+                position = (x, y, gray.shape[1], gray.shape[0])
+                psm = POT_OCR_PSM_REGION
+            else:
+                position = (0, 0, image.shape[1], image.shape[0])
+                psm = POT_OCR_PSM_FULL
             
             # Use OCR to find numbers (pot amounts)
-            if self.ocr_enabled:
-                text = pytesseract.image_to_string(gray, config='--psm 6')
+            if self.ocr_enabled and gray.size and self._has_text_contrast(gray):
+                if TESSEROCR_AVAILABLE:
+                    text = self._tesserocr_text(gray, psm, POT_OCR_CHARS)
+                else:
+                    text = pytesseract.image_to_string(
+                        gray, config=f'--psm {psm} -c tessedit_char_whitelist={POT_OCR_CHARS}')
                 
                 # Look for currency patterns
-                import re
-                currency_patterns = [
-                    r'\$(\d+(?:,\d{3})*(?:\.\d{2})?)',  # $1,234.56
-                    r'(\d+(?:,\d{3})*(?:\.\d{2})?)',   # 1,234.56
-                    r'(\d+\.\d{2})',                    # 123.45
-                ]
-                
-                for pattern in currency_patterns:
-                    matches = re.findall(pattern, text)
+                for pattern in _CURRENCY_PATTERNS:
+                    matches = pattern.findall(text)
                     if matches:
                         # Convert to float
                         amount_str = matches[0].replace(',', '')
@@ -284,7 +715,7 @@ class ScreenCapture:
                             return DetectedPot(
                                 amount=amount,
                                 confidence=0.7,  # Placeholder confidence
-                                position=(0, 0, image.shape[1], image.shape[0])
+                                position=position
                             )
                         except ValueError:
                             continue
@@ -295,40 +726,24 @@ class ScreenCapture:
             print(f"Error detecting pot: {e}")
             return None
     
+    def _has_text_contrast(self, gray: np.ndarray) -> bool:
+        """Cheap reject before OCR: does the region have enough pixels standing out from their surroundings?"""
+        # Equivalent to an adaptive mean threshold in both directions (light and dark text)
+        local_mean = cv2.blur(gray, (15, 15))
+        contrast = cv2.absdiff(gray, local_mean)
+        return cv2.countNonZero(cv2.compare(contrast, POT_TEXT_CONTRAST, cv2.CMP_GT)) >= POT_MIN_TEXT_PIXELS
+    
     def _organize_cards_by_suits(self, cards: List[DetectedCard]) -> OrganizedCards:
         """Organize detected cards into columns by suits"""
-        # Initialize suit collections
-        hearts = []
-        diamonds = []
-        clubs = []
-        spades = []
-        
-        # Sort cards by suit
-        for card in cards:
-            suit = card.suit.lower()
-            if suit == 'h':
-                hearts.append(card)
-            elif suit == 'd':
-                diamonds.append(card)
-            elif suit == 'c':
-                clubs.append(card)
-            elif suit == 's':
-                spades.append(card)
-        
-        # Sort each suit by rank (A, K, Q, J, 10, 9, ..., 2)
-        rank_order = {
-            'A': 14, 'K': 13, 'Q': 12, 'J': 11,
-            '10': 10, '9': 9, '8': 8, '7': 7,
-            '6': 6, '5': 5, '4': 4, '3': 3, '2': 2
-        }
-        
-        def sort_by_rank(card_list):
-            return sorted(card_list, key=lambda card: rank_order.get(card.rank, 0), reverse=True)
+        batch = CardBatch.from_cards(cards)
         
-        hearts = sort_by_rank(hearts)
-        diamonds = sort_by_rank(diamonds)
-        clubs = sort_by_rank(clubs)
-        spades = sort_by_rank(spades)
+        # Group cards by suit, each sorted by rank (A, K, Q, J, 10, 9, ..., 2)
+        columns = []
+        for suit in _SUIT_CODES:
+            indices = np.flatnonzero(batch.suits == suit)
+            indices = indices[np.argsort(-batch.ranks[indices], kind="stable")]
+            columns.append([cards[i] for i in indices])
+        hearts, diamonds, clubs, spades = columns
         
         return OrganizedCards(
             hearts=hearts,
@@ -367,8 +782,8 @@ class ScreenCapture:
             return self.last_analysis
         return None
     
-    def get_organized_cards_display(self) -> Optional[str]:
-        """Get organized cards as a formatted string for display"""
+    def get_organized_cards_display(self, color: bool = False) -> Optional[str]:
+        """Get organized cards as a formatted string for display, optionally ANSI-colored for a terminal"""
         if not hasattr(self, 'last_analysis') or not self.last_analysis:
             return None
         
@@ -376,90 +791,27 @@ class ScreenCapture:
         if not organized_cards:
             return "No cards detected"
         
+        title, header, row, total = _COLORED_DISPLAY if color else _PLAIN_DISPLAY
+        
         # Create formatted display with columns
-        display_lines = []
-        display_lines.append("Cards Organized by Suits:")
-        display_lines.append("=" * 80)
-        
-        # Get all cards for each suit
-        hearts_cards = [f"{card.rank}{card.suit.upper()}" for card in organized_cards.hearts]
-        diamonds_cards = [f"{card.rank}{card.suit.upper()}" for card in organized_cards.diamonds]
-        clubs_cards = [f"{card.rank}{card.suit.upper()}" for card in organized_cards.clubs]
-        spades_cards = [f"{card.rank}{card.suit.upper()}" for card in organized_cards.spades]
-        
-        # Find the maximum number of cards in any suit
-        max_cards = max(len(hearts_cards), len(diamonds_cards), len(clubs_cards), len(spades_cards))
-        
-        # Create header row
-        header = f"{'♥ Hearts':<20}|{'♦ Diamonds':<20}|{'♣ Clubs':<20}|{'♠ Spades':<20}"
-        display_lines.append(header)
-        display_lines.append("-" * 80)
+        display_lines = [title, "=" * 80, header, "-" * 80]
         
-        # Create card rows
-        for i in range(max_cards):
-            hearts_card = hearts_cards[i] if i < len(hearts_cards) else ""
-            diamonds_card = diamonds_cards[i] if i < len(diamonds_cards) else ""
-            clubs_card = clubs_cards[i] if i < len(clubs_cards) else ""
-            spades_card = spades_cards[i] if i < len(spades_cards) else ""
-            
-            row = f"{hearts_card:<20}|{diamonds_card:<20}|{clubs_card:<20}|{spades_card:<20}"
-            display_lines.append(row)
+        # Create card rows, padding shorter suits with blanks
+        columns = (
+            [f"{card.rank}{card.suit.upper()}" for card in suit_cards]
+            for suit_cards in (organized_cards.hearts, organized_cards.diamonds,
+                               organized_cards.clubs, organized_cards.spades)
+        )
+        display_lines.extend(row.format(*cards) for cards in zip_longest(*columns, fillvalue=""))
         
         display_lines.append("-" * 80)
-        display_lines.append(f"Total cards: {organized_cards.total_cards}")
+        display_lines.append(total.format(organized_cards.total_cards))
         
         return "\n".join(display_lines)
     
     def get_organized_cards_colored_display(self) -> Optional[str]:
         """Get organized cards as a colored formatted string for terminal display"""
-        if not hasattr(self, 'last_analysis') or not self.last_analysis:
-            return None
-        
-        organized_cards = self.last_analysis.get("organized_cards")
-        if not organized_cards:
-            return "No cards detected"
-        
-        # ANSI color codes
-        RED = '\033[91m'
-        BLUE = '\033[94m'
-        GREEN = '\033[92m'
-        BLACK = '\033[30m'
-        BOLD = '\033[1m'
-        RESET = '\033[0m'
-        
-        # Create formatted display with colored columns
-        display_lines = []
-        display_lines.append(f"{BOLD}Cards Organized by Suits:{RESET}")
-        display_lines.append("=" * 80)
-        
-        # Get all cards for each suit
-        hearts_cards = [f"{card.rank}{card.suit.upper()}" for card in organized_cards.hearts]
-        diamonds_cards = [f"{card.rank}{card.suit.upper()}" for card in organized_cards.diamonds]
-        clubs_cards = [f"{card.rank}{card.suit.upper()}" for card in organized_cards.clubs]
-        spades_cards = [f"{card.rank}{card.suit.upper()}" for card in organized_cards.spades]
-        
-        # Find the maximum number of cards in any suit
-        max_cards = max(len(hearts_cards), len(diamonds_cards), len(clubs_cards), len(spades_cards))
-        
-        # Create header row with colors
-        header = f"{RED}{'♥ Hearts':<20}{RESET}|{BLUE}{'♦ Diamonds':<20}{RESET}|{GREEN}{'♣ Clubs':<20}{RESET}|{BLACK}{'♠ Spades':<20}{RESET}"
-        display_lines.append(header)
-        display_lines.append("-" * 80)
-        
-        # Create card rows with colors
-        for i in range(max_cards):
-            hearts_card = hearts_cards[i] if i < len(hearts_cards) else ""
-            diamonds_card = diamonds_cards[i] if i < len(diamonds_cards) else ""
-            clubs_card = clubs_cards[i] if i < len(clubs_cards) else ""
-            spades_card = spades_cards[i] if i < len(spades_cards) else ""
-            
-            row = f"{RED}{hearts_card:<20}{RESET}|{BLUE}{diamonds_card:<20}{RESET}|{GREEN}{clubs_card:<20}{RESET}|{BLACK}{spades_card:<20}{RESET}"
-            display_lines.append(row)
-        
-        display_lines.append("-" * 80)
-        display_lines.append(f"{BOLD}Total cards: {organized_cards.total_cards}{RESET}")
-        
-        return "\n".join(display_lines)
+        return self.get_organized_cards_display(color=True)
     
     def get_organized_cards_dict(self) -> Optional[Dict[str, List[str]]]:
         """Get organized cards as a dictionary for programmatic access"""
@@ -481,14 +833,26 @@ class ScreenCapture:
     def set_capture_region(self, region: Tuple[int, int, int, int]):
         """Set the screen region to capture"""
         self.capture_region = region
+        self._invalidate_analysis()
+    
+    def set_pot_region(self, region: Optional[Tuple[int, int, int, int]]):
+        """Set the region (x, y, width, height) of the capture to read the pot from"""
+        self.pot_region = region
+        self._invalidate_analysis()
     
     def enable_card_detection(self, enabled: bool):
         """Enable or disable card detection"""
         self.card_detection_enabled = enabled
+        self._invalidate_analysis()
     
     def enable_pot_detection(self, enabled: bool):
         """Enable or disable pot detection"""
         self.pot_detection_enabled = enabled
+        self._invalidate_analysis()
+    
+    def _invalidate_analysis(self):
+        """Force the next frame through the full pipeline after a settings change"""
+        self._prev_analysis = None
     
     def get_status(self) -> Dict[str, Any]:
         """Get current capture status"""
@@ -498,6 +862,7 @@ class ScreenCapture:
             "update_frequency": self.update_frequency,
             "card_detection_enabled": self.card_detection_enabled,
             "pot_detection_enabled": self.pot_detection_enabled,
+            "pot_region": self.pot_region,
             "ocr_enabled": self.ocr_enabled
         }
     
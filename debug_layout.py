@@ -6,7 +6,6 @@ Helps identify and fix issues with the React component
 
 import subprocess
 import sys
-import os
 from pathlib import Path
 
 def check_dependencies():
@@ -22,10 +21,8 @@ def check_dependencies():
     node_modules = frontend_dir / "node_modules"
     if not node_modules.exists():
         print("📦 Installing frontend dependencies...")
-        os.chdir(frontend_dir)
         try:
-            subprocess.run(["npm", "install"], check=True)
-            os.chdir("..")
+            subprocess.run(["npm", "install"], check=True, cwd=frontend_dir)
         except subprocess.CalledProcessError as e:
             print(f"❌ Failed to install dependencies: {e}")
             return False
@@ -91,13 +88,13 @@ def run_type_check():
     print("🔍 Running TypeScript type check...")
     
     frontend_dir = Path("frontend")
-    os.chdir(frontend_dir)
     
     try:
         result = subprocess.run(
             ["npx", "tsc", "--noEmit"], 
             capture_output=True, 
-            text=True
+            text=True,
+            cwd=frontend_dir
         )
         
         if result.returncode == 0:
@@ -111,8 +108,6 @@ def run_type_check():
     except Exception as e:
         print(f"❌ Error running type check: {e}")
         return False
-    finally:
-        os.chdir("..")
 
 def suggest_fixes():
     """Suggest fixes for common issues"""
@@ -4,22 +4,64 @@ Setup script for Pot Logic Poker Bot
 Installs dependencies and initializes the project
 """
 
+import hashlib
+import shutil
 import subprocess
 import sys
 import os
 from pathlib import Path
 
-def run_command(command, description):
+# Project-local pip cache; re-running setup installs from the wheels cached here
+PIP_CACHE_DIR = ".pip-cache"
+# Optional pre-downloaded wheels (pip download -d wheels -r requirements.txt) for offline installs
+WHEELS_DIR = "wheels"
+
+# Stamps recording the dependency manifests last installed, stored inside what they describe
+REQUIREMENTS_STAMP = Path("venv") / ".req.sha256"
+PACKAGE_LOCK_STAMP = Path("frontend") / "node_modules" / ".package-lock.sha256"
+
+def run_command(argv, description, env=None, cwd=None):
     """Run a command and handle errors"""
+    return run_batch([argv], description, env=env, cwd=cwd)
+
+def stream_command(argv, env=None, cwd=None):
+    """Run a command, echoing its combined output line by line as it arrives"""
+    with subprocess.Popen(argv, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                          text=True, bufsize=1, env=env, cwd=cwd) as proc:
+        for line in proc.stdout:
+            print(line, end="")
+    if proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, argv)
+
+def run_batch(commands, description, env=None, cwd=None):
+    """Run several commands (argv lists, no shell) in order, stopping at the first failure
+
+    Output is streamed as it is produced, so errors appear above the failure message.
+    """
     print(f"🔄 {description}...")
     try:
-        result = subprocess.run(command, shell=True, check=True, capture_output=True, text=True)
-        print(f"✅ {description} completed")
-        return True
+        for argv in commands:
+            stream_command(argv, env=env, cwd=cwd)
     except subprocess.CalledProcessError as e:
         print(f"❌ {description} failed: {e}")
-        print(f"Error output: {e.stderr}")
         return False
+    except FileNotFoundError as e:
+        print(f"❌ {description} failed: {e}")
+        return False
+    print(f"✅ {description} completed")
+    return True
+
+def file_digest(path):
+    """SHA-256 hex digest of a file's contents"""
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+def stamp_matches(source, stamp):
+    """Check whether a stamp file records the current digest of source"""
+    return Path(source).exists() and stamp.exists() and stamp.read_text().strip() == file_digest(source)
+
+def write_stamp(source, stamp):
+    """Record the current digest of source in a stamp file"""
+    stamp.write_text(file_digest(source))
 
 def check_python_version():
     """Check if Python version is compatible"""
@@ -45,25 +87,44 @@ def install_backend_dependencies():
     """Install Python backend dependencies"""
     print("\n📦 Installing backend dependencies...")
     
-    # Create virtual environment if it doesn't exist
-    venv_path = Path("venv")
-    if not venv_path.exists():
-        print("🔄 Creating virtual environment...")
-        if not run_command(f"{sys.executable} -m venv venv", "Creating virtual environment"):
-            return False
+    # Nothing to do if requirements.txt hasn't changed since the last successful install
+    if stamp_matches("requirements.txt", REQUIREMENTS_STAMP):
+        print("✅ Python dependencies up to date")
+        return True
     
-    # Determine the correct pip path
+    # Determine the correct python path
     if os.name == 'nt':  # Windows
-        pip_path = "venv\\Scripts\\pip"
         python_path = "venv\\Scripts\\python"
     else:  # Unix/Linux/Mac
-        pip_path = "venv/bin/pip"
         python_path = "venv/bin/python"
     
-    # Install requirements
-    if not run_command(f"{pip_path} install -r requirements.txt", "Installing Python dependencies"):
+    commands = []
+    
+    # Create virtual environment if it doesn't exist
+    if not Path("venv").exists():
+        print("🔄 Creating virtual environment...")
+        commands.append([sys.executable, "-m", "venv", "venv"])
+    
+    if Path(WHEELS_DIR).is_dir():
+        # Offline fast path: resolve only against the local wheels, never contacting the index
+        print(f"📦 Installing from local wheels in {WHEELS_DIR}/")
+        commands.append([python_path, "-m", "pip", "install", "--no-index", f"--find-links={WHEELS_DIR}",
+                         "--only-binary=:all:", "--progress-bar", "off", "-r", "requirements.txt"])
+    else:
+        # Upgrade pip and install requirements in a single pip run so pip only starts up once.
+        # Going through python -m pip lets it replace itself on Windows; with wheel present pip caches
+        # the wheels it builds, and preferring binaries avoids most builds. Requirements are pinned,
+        # so --upgrade only affects the tooling
+        commands.append([python_path, "-m", "pip", "install", "--upgrade", "--prefer-binary",
+                         "--progress-bar", "off", "pip", "wheel", "setuptools", "-r", "requirements.txt"])
+    
+    # Keep pip's cache in the project so it survives deleting the venv
+    env = dict(os.environ, PIP_CACHE_DIR=str(Path(PIP_CACHE_DIR).resolve()))
+    
+    if not run_batch(commands, "Installing Python dependencies", env=env):
         return False
     
+    write_stamp("requirements.txt", REQUIREMENTS_STAMP)
     return True
 
 def install_frontend_dependencies():
@@ -75,15 +136,20 @@ def install_frontend_dependencies():
         print("❌ Frontend directory not found")
         return False
     
-    # Change to frontend directory
-    os.chdir(frontend_dir)
+    # Nothing to do if the lockfile hasn't changed since the last successful install
+    package_lock = frontend_dir / "package-lock.json"
+    if stamp_matches(package_lock, PACKAGE_LOCK_STAMP):
+        print("✅ npm dependencies up to date")
+        return True
     
-    # Install npm dependencies
-    if not run_command("npm install", "Installing npm dependencies"):
+    # Install npm dependencies from the frontend directory; without a shell, npm.cmd on Windows must be resolved explicitly
+    npm = shutil.which("npm") or "npm"
+    if not run_command([npm, "install"], "Installing npm dependencies", cwd=frontend_dir):
         return False
     
-    # Change back to root directory
-    os.chdir("..")
+    # npm install may rewrite the lockfile, so stamp what it left behind
+    if package_lock.exists():
+        write_stamp(package_lock, PACKAGE_LOCK_STAMP)
     return True
 
 def create_env_file():
@@ -97,7 +163,6 @@ def create_env_file():
     
     if env_example.exists():
         print("🔄 Creating .env file from template...")
-        import shutil
         shutil.copy(env_example, env_file)
         print("✅ .env file created")
         return True
@@ -169,6 +234,7 @@ def main():
     print("1. Copy env.example to .env and configure your settings")
     print("2. Run 'python start.py' to start both servers")
     print("3. Open http://localhost:3000 in your browser")
+    print("\nRe-running setup reuses the wheels cached in .pip-cache, so it is near-instant")
     print("\nFor development:")
     print("- Backend: python -m uvicorn app.main:app --reload")
     print("- Frontend: cd frontend && npm run dev")
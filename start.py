@@ -8,50 +8,111 @@ import subprocess
 import sys
 import os
 import time
+import shutil
 import signal
-import threading
+import socket
+from importlib.metadata import PackageNotFoundError, distribution
 from pathlib import Path
 
-def run_backend():
-    """Run the FastAPI backend server"""
+from setup import PACKAGE_LOCK_STAMP, stamp_matches, write_stamp
+
+# npm's download cache, kept next to the frontend so lockfile-matched tarballs are reused
+NPM_CACHE_DIR = ".npm-cache"
+
+BACKEND_PORT = 8000
+# Upper bound on how long to wait for uvicorn to start listening before starting the frontend anyway
+BACKEND_READY_TIMEOUT = 5.0
+
+# Give each server its own process group so stop_process can signal it and all of its children
+if os.name == 'nt':
+    GROUP_KWARGS = {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+else:
+    GROUP_KWARGS = {"start_new_session": True}
+
+def spawn_backend():
+    """Start the FastAPI backend server as a child process"""
     print("🚀 Starting backend server...")
-    try:
-        subprocess.run([
-            sys.executable, "-m", "uvicorn", 
-            "app.main:app", 
-            "--host", "0.0.0.0", 
-            "--port", "8000", 
-            "--reload"
-        ], check=True)
-    except KeyboardInterrupt:
-        print("\n👋 Backend server stopped")
-    except Exception as e:
-        print(f"❌ Backend error: {e}")
+    return subprocess.Popen([
+        sys.executable, "-m", "uvicorn", 
+        "app.main:app", 
+        "--host", "0.0.0.0", 
+        "--port", str(BACKEND_PORT), 
+        "--reload"
+    ], **GROUP_KWARGS)
+
+def wait_for_port(process, port, timeout=BACKEND_READY_TIMEOUT):
+    """Poll until something accepts connections on a local port; False on timeout or if process exits"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline and process.poll() is None:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.05).close()
+            return True
+        except OSError:
+            time.sleep(0.05)
+    return False
 
-def run_frontend():
-    """Run the React frontend development server"""
+def spawn_frontend():
+    """Start the React frontend development server as a child process"""
     print("🎨 Starting frontend server...")
     frontend_dir = Path("frontend")
     
     if not frontend_dir.exists():
         print("❌ Frontend directory not found. Please run 'npm install' in the frontend directory first.")
-        return
+        return None
+    
+    # Without a shell, npm.cmd on Windows must be resolved explicitly
+    npm = shutil.which("npm") or "npm"
     
+    # Reinstall only when the lockfile changed since the last install; setup.py writes the same stamp
+    package_lock = frontend_dir / "package-lock.json"
+    if not stamp_matches(package_lock, PACKAGE_LOCK_STAMP):
+        print("📦 Installing frontend dependencies...")
+        # npm ci installs exactly what the lockfile pins, and the local cache lets it skip the network
+        command = [npm, "ci"] if package_lock.exists() else [npm, "install"]
+        env = dict(os.environ, npm_config_cache=str((frontend_dir / NPM_CACHE_DIR).resolve()))
+        subprocess.run(command + ["--prefer-offline"], check=True, cwd=frontend_dir, env=env)
+        if package_lock.exists():
+            write_stamp(package_lock, PACKAGE_LOCK_STAMP)
+    
+    # Start development server
+    return subprocess.Popen([npm, "run", "dev"], cwd=frontend_dir, **GROUP_KWARGS)
+
+def stop_process(process):
+    """Terminate a server and everything it started (uvicorn's reloader, npm's dev server)"""
+    if process.poll() is not None:
+        return
+    if os.name == 'nt':
+        # CTRL_BREAK reaches the whole console process group, unlike terminate()
+        process.send_signal(signal.CTRL_BREAK_EVENT)
+    else:
+        # Each server runs in its own session, so its process group holds all its children
+        os.killpg(process.pid, signal.SIGTERM)
     try:
-        # Change to frontend directory
-        os.chdir(frontend_dir)
-        
-        # Check if node_modules exists
-        if not Path("node_modules").exists():
-            print("📦 Installing frontend dependencies...")
-            subprocess.run(["npm", "install"], check=True)
-        
-        # Start development server
-        subprocess.run(["npm", "run", "dev"], check=True)
-    except KeyboardInterrupt:
-        print("\n👋 Frontend server stopped")
-    except Exception as e:
-        print(f"❌ Frontend error: {e}")
+        process.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+def wait_for_exit(procs):
+    """Block until one of the servers exits and return it"""
+    if not hasattr(os, "waitid"):
+        # Windows has no wait-for-any-child; poll instead
+        while True:
+            for p in procs:
+                if p.poll() is not None:
+                    return p
+            time.sleep(0.5)
+    pids = {p.pid for p in procs}
+    while True:
+        # Sleep in the kernel until a child exits; WNOWAIT leaves it for Popen to reap
+        try:
+            info = os.waitid(os.P_ALL, 0, os.WEXITED | os.WNOWAIT)
+        except ChildProcessError:
+            info = None  # every child is already reaped
+        for p in procs:
+            if p.poll() is not None:
+                return p
+        if info is not None and info.si_pid not in pids:
+            os.waitpid(info.si_pid, 0)  # not a server; reap it so waitid doesn't report it again
 
 def main():
     """Main startup function"""
@@ -63,22 +124,25 @@ def main():
         print("❌ Please run this script from the project root directory")
         sys.exit(1)
     
-    # Check if requirements are installed
+    # Check if requirements are installed; reading package metadata avoids importing them here
     try:
-        import fastapi
-        import uvicorn
-    except ImportError:
+        distribution("fastapi")
+        distribution("uvicorn")
+    except PackageNotFoundError:
         print("📦 Installing backend dependencies...")
         subprocess.run([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"], check=True)
     
-    # Start servers in separate threads
-    backend_thread = threading.Thread(target=run_backend, daemon=True)
-    frontend_thread = threading.Thread(target=run_frontend, daemon=True)
-    
+    # Start both servers as child processes
+    procs = []
     try:
-        backend_thread.start()
-        time.sleep(2)  # Give backend time to start
-        frontend_thread.start()
+        backend = spawn_backend()
+        procs.append(backend)
+        # Start the frontend once the backend is listening, so its proxy doesn't hit a closed port
+        if not wait_for_port(backend, BACKEND_PORT):
+            print("⚠️  Backend is not accepting connections yet, starting frontend anyway")
+        frontend = spawn_frontend()
+        if frontend is not None:
+            procs.append(frontend)
         
         print("\n✅ Both servers are starting...")
         print("🌐 Backend: http://localhost:8000")
@@ -86,15 +150,21 @@ def main():
         print("📚 API Docs: http://localhost:8000/docs")
         print("\nPress Ctrl+C to stop both servers")
         
-        # Keep main thread alive while servers run
+        # Run until Ctrl+C (or SIGTERM) or until either server exits
+        if os.name != 'nt':
+            signal.signal(signal.SIGTERM, signal.default_int_handler)
         try:
-            while True:
-                time.sleep(1)
+            exited = wait_for_exit(procs)
         except KeyboardInterrupt:
             print("\n👋 Shutting down servers...")
+        else:
+            print(f"❌ Server exited with code {exited.returncode}, shutting down")
         
     except Exception as e:
         print(f"❌ Error: {e}")
+    finally:
+        for p in procs:
+            stop_process(p)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
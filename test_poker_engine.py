@@ -4,23 +4,29 @@ Test script for Pot Logic Poker Engine
 Demonstrates the core functionality
 """
 
-import sys
-from pathlib import Path
+import contextlib
+import io
+import multiprocessing
+import os
+import random
+import traceback
+from collections import Counter
+from itertools import combinations
 
-# Add the app directory to the path
-sys.path.append(str(Path.cwd()))
+# The project root is on sys.path both when this file is run directly (its own directory)
+# and under pytest (rootdir insertion), so app imports as a package from any working directory
+from app.poker_engine import PokerEngine, CARD_INTS, _cactus_rank, _cactus_category
 
-from app.poker_engine import PokerEngine
+# One engine shared by every test; it holds no per-hand state
+ENGINE = PokerEngine()
 
 def test_pot_odds_calculation():
     """Test pot odds calculation"""
     print("🧮 Testing Pot Odds Calculation")
     print("-" * 40)
     
-    poker_engine = PokerEngine()
-    
     # Test case 1: Basic pot odds
-    result = poker_engine.calculate_pot_odds(
+    result = ENGINE.calculate_pot_odds(
         pot_size=100,
         bet_to_call=20,
         player_cards=["Ah", "Kh"],
@@ -48,10 +54,8 @@ def test_hand_evaluation():
     print("🃏 Testing Hand Evaluation")
     print("-" * 40)
     
-    poker_engine = PokerEngine()
-    
     # Test case 1: Royal Flush
-    result = poker_engine.evaluate_hand(
+    result = ENGINE.evaluate_hand(
         player_cards=["Ah", "Kh"],
         community_cards=["Qh", "Jh", "10h"]
     )
@@ -64,7 +68,7 @@ def test_hand_evaluation():
     print()
     
     # Test case 2: Full House
-    result = poker_engine.evaluate_hand(
+    result = ENGINE.evaluate_hand(
         player_cards=["As", "Ks"],
         community_cards=["Ah", "Kh", "Qd"]
     )
@@ -76,25 +80,125 @@ def test_hand_evaluation():
     print(f"Strength: {result['strength_percentage']:.1f}%")
     print()
 
+def test_hand_classes():
+    """Test one fixed hand per class, plus hands the old evaluator misread"""
+    print("🏆 Testing Hand Classes")
+    print("-" * 40)
+    
+    cases = [
+        (["Ah", "Kh"], ["Qh", "Jh", "10h"], "ROYAL_FLUSH"),
+        (["9s", "8s"], ["7s", "6s", "5s", "2d"], "STRAIGHT_FLUSH"),
+        (["Ah", "2h"], ["3h", "4h", "5h"], "STRAIGHT_FLUSH"),          # steel wheel
+        (["Qc", "Qd"], ["Qh", "Qs", "3d"], "FOUR_OF_A_KIND"),
+        (["As", "Ks"], ["Ah", "Kh", "Ad"], "FULL_HOUSE"),
+        (["Ah", "Ad"], ["Ac", "Kd", "Ks", "Kc", "2h"], "FULL_HOUSE"),  # two trips
+        (["2d", "7d"], ["9d", "Jd", "Kd", "Ac"], "FLUSH"),
+        (["Ah", "Kh"], ["Qh", "Jh", "9h", "10c"], "FLUSH"),            # flush and straight, not a straight flush
+        (["9h", "10h"], ["Jh", "Qh", "2h", "Kc"], "FLUSH"),            # flush and straight, not a royal flush
+        (["Ah", "2d"], ["3c", "4s", "5h"], "STRAIGHT"),                # wheel
+        (["10c", "Jd"], ["Qh", "Ks", "Ac", "2d"], "STRAIGHT"),
+        (["7c", "7d"], ["7h", "Ks", "2c"], "THREE_OF_A_KIND"),
+        (["Jc", "Jd"], ["4h", "4s", "Ac"], "TWO_PAIR"),
+        (["9c", "9d"], ["4h", "Ks", "Ac"], "PAIR"),
+        (["2c", "7d"], ["9h", "Js", "Kc"], "HIGH_CARD"),
+    ]
+    
+    for player_cards, community_cards, expected in cases:
+        result = ENGINE.evaluate_hand(player_cards=player_cards, community_cards=community_cards)
+        lookup = _cactus_category(_cactus_rank([CARD_INTS[card] for card in player_cards + community_cards]))
+        print(f"{' '.join(player_cards + community_cards)}: {result['hand_description']}")
+        assert result["hand_rank"] == expected, (player_cards, community_cards, result["hand_rank"])
+        assert lookup.name == expected, (player_cards, community_cards, lookup.name)
+    
+    # Wheel ranks below six-high
+    assert ENGINE.evaluate_hand(["Ah", "2d"], ["3c", "4s", "5h"])["hand_value"] == 5
+    print()
+
+# Category order for the brute-force evaluator, weakest first
+_NAIVE_CATEGORIES = (
+    "HIGH_CARD", "PAIR", "TWO_PAIR", "THREE_OF_A_KIND", "STRAIGHT",
+    "FLUSH", "FULL_HOUSE", "FOUR_OF_A_KIND", "STRAIGHT_FLUSH"
+)
+_NAIVE_VALUES = {"J": 11, "Q": 12, "K": 13, "A": 14}
+
+def _naive_five(cards):
+    """Score 5 cards as (category, tiebreak ranks) by direct inspection; bigger is stronger"""
+    values = sorted((_NAIVE_VALUES.get(card[:-1]) or int(card[:-1]) for card in cards), reverse=True)
+    counts = Counter(values)
+    flush = len({card[-1] for card in cards}) == 1
+    straight_high = 0
+    if len(counts) == 5:
+        if values[0] - values[4] == 4:
+            straight_high = values[0]
+        elif values == [14, 5, 4, 3, 2]:
+            straight_high = 5
+    # Ranks ordered by group size, then rank: quads/trips/pairs before kickers
+    ranks = tuple(sorted(counts, key=lambda value: (counts[value], value), reverse=True))
+    shape = sorted(counts.values(), reverse=True)
+    if straight_high and flush:
+        return 8, (straight_high,)
+    if shape[0] == 4:
+        return 7, ranks
+    if shape[:2] == [3, 2]:
+        return 6, ranks
+    if flush:
+        return 5, tuple(values)
+    if straight_high:
+        return 4, (straight_high,)
+    if shape[0] == 3:
+        return 3, ranks
+    if shape[:2] == [2, 2]:
+        return 2, ranks
+    if shape[0] == 2:
+        return 1, ranks
+    return 0, tuple(values)
+
+def _naive_best(cards):
+    """Best 5-card score among all subsets of cards"""
+    return max(_naive_five(five) for five in combinations(cards, 5))
+
+def test_evaluator_brute_force():
+    """Cross-check both evaluators against a brute-force best-of-21 scorer on random 7-card hands"""
+    print("🔍 Testing Evaluator Against Brute Force")
+    print("-" * 40)
+    
+    rng = random.Random(7)
+    deck = list(CARD_INTS)
+    hands = [rng.sample(deck, 7) for _ in range(400)]
+    scores = [_naive_best(hand) for hand in hands]
+    ranks = [_cactus_rank([CARD_INTS[card] for card in hand]) for hand in hands]
+    
+    for hand, score, rank in zip(hands, scores, ranks):
+        expected = _NAIVE_CATEGORIES[score[0]]
+        if expected == "STRAIGHT_FLUSH" and score[1] == (14,):
+            expected = "ROYAL_FLUSH"
+        assert _cactus_category(rank).name == expected, (hand, expected)
+        assert ENGINE.evaluate_hand(hand[:2], hand[2:])["hand_rank"] == expected, (hand, expected)
+    
+    # Lower lookup values are stronger; every pair must order the same way as the brute force
+    for (score_a, rank_a), (score_b, rank_b) in zip(zip(scores, ranks), zip(scores[1:], ranks[1:])):
+        assert (score_a > score_b) == (rank_a < rank_b) and (score_a == score_b) == (rank_a == rank_b)
+    
+    print(f"{len(hands)} random hands agree with the brute-force evaluator")
+    print()
+
 def test_probability_calculation():
     """Test probability calculation"""
     print("📊 Testing Probability Calculation")
     print("-" * 40)
     
-    poker_engine = PokerEngine()
-    
     # Test case: Pre-flop probabilities
-    result = poker_engine.calculate_probabilities(
+    result = ENGINE.calculate_probabilities(
         player_cards=["Ah", "Kh"],
         community_cards=[],
         num_players=6,
-        num_simulations=1000  # Reduced for faster testing
+        num_simulations=20000
     )
     
     print(f"Player Cards: Ah Kh")
     print(f"Community Cards: None (Pre-flop)")
     print(f"Players: 6")
-    print(f"Simulations: 1000")
+    print(f"Simulations: {result['simulations']}")
     print()
     print(f"Win Probability: {result['win_probability']:.1f}%")
     print(f"Tie Probability: {result['tie_probability']:.1f}%")
@@ -106,8 +210,6 @@ def test_card_parsing():
     print("🎴 Testing Card Parsing")
     print("-" * 40)
     
-    poker_engine = PokerEngine()
-    
     # Test various card formats
     test_cards = [
         ["Ah", "Kh"],  # Standard format
@@ -117,7 +219,7 @@ def test_card_parsing():
     ]
     
     for i, cards in enumerate(test_cards, 1):
-        parsed = poker_engine.parse_cards(cards)
+        parsed = ENGINE.parse_cards(cards)
         print(f"Test {i}: {cards} -> {[str(card) for card in parsed]}")
     print()
 
@@ -126,46 +228,74 @@ def test_different_positions():
     print("🎯 Testing Different Positions")
     print("-" * 40)
     
-    poker_engine = PokerEngine()
-    
     positions = ["early", "middle", "cutoff", "button", "small_blind", "big_blind"]
     
-    for position in positions:
-        result = poker_engine.calculate_pot_odds(
-            pot_size=100,
-            bet_to_call=20,
-            player_cards=["Ah", "Kh"],
-            community_cards=["Qh", "Jh", "10h"],
-            position=position,
-            num_players=6
-        )
-        
+    # Same hand from every seat: evaluate it once and fan out over the positions
+    results = ENGINE.calculate_pot_odds_batch(
+        pot_size=100,
+        bet_to_call=20,
+        player_cards=["Ah", "Kh"],
+        community_cards=["Qh", "Jh", "10h"],
+        positions=positions,
+        num_players=6
+    )
+    
+    assert results[positions.index("button")] == ENGINE.calculate_pot_odds(
+        pot_size=100,
+        bet_to_call=20,
+        player_cards=["Ah", "Kh"],
+        community_cards=["Qh", "Jh", "10h"],
+        position="button",
+        num_players=6
+    )
+    
+    for position, result in zip(positions, results):
         print(f"Position: {position}")
         print(f"  Implied Odds: ${result['implied_odds']:.2f}")
         print(f"  Recommendation: {result['recommendation']}")
     print()
 
+def _run_test(test):
+    """Run one test in a worker, capturing its output so reports don't interleave"""
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        try:
+            test()
+        except Exception:
+            return buffer.getvalue(), traceback.format_exc()
+    return buffer.getvalue(), None
+
 def main():
     """Run all tests"""
     print("🎰 Pot Logic Poker Engine Tests")
     print("=" * 50)
     print()
     
-    try:
-        test_card_parsing()
-        test_pot_odds_calculation()
-        test_hand_evaluation()
-        test_probability_calculation()
-        test_different_positions()
-        
-        print("✅ All tests completed successfully!")
-        print("\nThe poker engine is working correctly.")
-        print("You can now use the web interface at http://localhost:3000")
-        
-    except Exception as e:
-        print(f"❌ Test failed: {e}")
-        import traceback
-        traceback.print_exc()
+    tests = [
+        test_card_parsing,
+        test_pot_odds_calculation,
+        test_hand_evaluation,
+        test_hand_classes,
+        test_evaluator_brute_force,
+        test_probability_calculation,
+        test_different_positions,
+    ]
+    
+    # The tests share no state, so run them side by side and print their reports in order.
+    # Spawned rather than forked workers: the engine may already have started numba's threads
+    with multiprocessing.get_context("spawn").Pool(processes=min(len(tests), os.cpu_count() or 1)) as pool:
+        results = pool.map(_run_test, tests)
+    
+    for output, error in results:
+        print(output, end="")
+        if error:
+            print(f"❌ Test failed: {error.strip().splitlines()[-1]}")
+            print(error, end="")
+            return
+    
+    print("✅ All tests completed successfully!")
+    print("\nThe poker engine is working correctly.")
+    print("You can now use the web interface at http://localhost:3000")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file